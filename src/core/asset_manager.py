@@ -0,0 +1,253 @@
+# =========================================
+# file: src/core/asset_manager.py
+# =========================================
+"""
+AssetManager — shared, ref-counted cache for fonts, images and sounds.
+
+Every scene and app used to load its own copies of the same fonts and
+surfaces. Assets are now keyed by content (a digest of the file bytes
+plus load parameters; name/size for system fonts), so identical assets
+are loaded once and shared. Callers hold an AssetHandle and release it
+when done — scenes in on_evict(), apps in release_assets(), which
+WindowManager calls when the window closes:
+
+    self.bg = window_manager.assets.image("assets/desk.png")
+    screen.blit(self.bg.value, (0, 0))
+    ...
+    self.bg.release()
+
+Assets with no remaining references stay cached until the memory
+budget is exceeded, then the least recently used ones are evicted.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import pygame
+
+
+class AssetHandle:
+    """A counted reference to a shared asset."""
+
+    __slots__ = ("_manager", "key", "value", "_released")
+
+    def __init__(self, manager, key, value):
+        self._manager = manager
+        self.key = key
+        self.value = value
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._manager._release(self.key)
+
+    def __enter__(self):
+        return self.value
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class _Entry:
+    __slots__ = ("value", "size", "refs", "kind")
+
+    def __init__(self, value, size, kind):
+        self.value = value
+        self.size = size
+        self.refs = 0
+        self.kind = kind
+
+
+class AssetManager:
+    def __init__(self, budget_bytes: int = 512 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.bytes_used = 0
+        self._entries = {}            # key → _Entry
+        self._idle = OrderedDict()    # keys with refs == 0, oldest first
+        self._loading = {}            # key → Future, while its loader runs
+        self._digests = {}            # (path, mtime, size) → digest
+        self._lock = threading.RLock()
+        self.stats = {
+            "loads": 0,
+            "hits": 0,
+            "evictions": 0,
+            "bytes_loaded": 0,
+            "load_seconds": 0.0,
+        }
+
+    # ------------------------------------------------------------
+    # Public loaders
+    # ------------------------------------------------------------
+    def sysfont(self, name: str, size: int, bold: bool = False, italic: bool = False):
+        key = ("sysfont", name.lower(), size, bold, italic)
+        return self.acquire(
+            key, lambda: pygame.font.SysFont(name, size, bold=bold, italic=italic),
+            kind="font", size=64 * 1024,
+        )
+
+    def font(self, path: str, size: int):
+        key = ("font", self._digest(path), size)
+        return self.acquire(
+            key, lambda: pygame.font.Font(path, size),
+            kind="font", size=os.path.getsize(path),
+        )
+
+    def image(self, path: str, alpha: bool = True):
+        key = self.image_key(path, alpha)
+        return self.acquire(
+            key, lambda: finish_surface(pygame.image.load(path), alpha), kind="surface"
+        )
+
+    def sound(self, path: str):
+        key = self.sound_key(path)
+        return self.acquire(key, lambda: pygame.mixer.Sound(path), kind="sound")
+
+    def image_key(self, path: str, alpha: bool = True):
+        return ("image", self._digest(path), alpha)
+
+    def sound_key(self, path: str):
+        return ("sound", self._digest(path))
+
+    # ------------------------------------------------------------
+    # Core cache
+    # ------------------------------------------------------------
+    def acquire(self, key, loader, kind: str = "other", size=None):
+        """
+        Return a handle for key, calling loader() only on a cache miss.
+        The key is reserved with a Future under the lock and loader()
+        runs outside it, so a slow load never blocks other keys; other
+        threads asking for the same key wait for that one load.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self.stats["hits"] += 1
+                    return self._take(key, entry)
+                pending = self._loading.get(key)
+                if pending is None:
+                    pending = self._loading[key] = Future()
+                    break
+            # Another thread is loading key: wait for it, then look again
+            # (the entry is published before the Future resolves).
+            pending.result()
+
+        start = time.perf_counter()
+        try:
+            value = loader()
+            if size is None:
+                size = estimate_asset_bytes(value)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            pending.set_exception(e)
+            raise
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            entry = _Entry(value, size, kind)
+            self._entries[key] = entry
+            del self._loading[key]
+            self.bytes_used += size
+            self.stats["loads"] += 1
+            self.stats["bytes_loaded"] += size
+            self.stats["load_seconds"] += elapsed
+            handle = self._take(key, entry)
+        pending.set_result(None)
+        return handle
+
+    def _take(self, key, entry):
+        """New handle on a cached entry. Call with the lock held."""
+        entry.refs += 1
+        self._idle.pop(key, None)
+        handle = AssetHandle(self, key, entry.value)
+        self._enforce_budget()
+        return handle
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _release(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs <= 0:
+                entry.refs = 0
+                self._idle[key] = None
+                self._enforce_budget()
+
+    def _enforce_budget(self):
+        while self.bytes_used > self.budget_bytes and self._idle:
+            key, _ = self._idle.popitem(last=False)
+            entry = self._entries.pop(key)
+            self.bytes_used -= entry.size
+            self.stats["evictions"] += 1
+
+    def purge(self):
+        """Drop every unreferenced asset now."""
+        with self._lock:
+            for key in list(self._idle):
+                entry = self._entries.pop(key)
+                self.bytes_used -= entry.size
+                self.stats["evictions"] += 1
+            self._idle.clear()
+
+    def report(self):
+        with self._lock:
+            by_kind = {}
+            for entry in self._entries.values():
+                kind = by_kind.setdefault(entry.kind, {"count": 0, "bytes": 0})
+                kind["count"] += 1
+                kind["bytes"] += entry.size
+            return {
+                "bytes_used": self.bytes_used,
+                "budget_bytes": self.budget_bytes,
+                "assets": len(self._entries),
+                "unreferenced": len(self._idle),
+                "by_kind": by_kind,
+                **self.stats,
+            }
+
+    # ------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------
+    def _digest(self, path: str) -> str:
+        """Content digest of a file, cached per (path, mtime, size)."""
+        st = os.stat(path)
+        stamp = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        digest = self._digests.get(stamp)
+        if digest is None:
+            h = hashlib.sha1()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            self._digests[stamp] = digest
+        return digest
+
+
+def finish_surface(surf, alpha: bool = True):
+    """Convert a decoded surface to the display format (main thread only)."""
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert_alpha() if alpha else surf.convert()
+    return surf
+
+
+def estimate_asset_bytes(value) -> int:
+    if isinstance(value, pygame.Surface):
+        return value.get_width() * value.get_height() * value.get_bytesize()
+    if pygame.mixer.get_init() and isinstance(value, pygame.mixer.Sound):
+        freq, fmt, channels = pygame.mixer.get_init()
+        return int(value.get_length() * freq * channels * (abs(fmt) // 8))
+    return 0
+
+
+# Shared by WindowManager, SceneManager and every scene/app.
+ASSETS = AssetManager()
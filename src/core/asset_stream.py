@@ -0,0 +1,288 @@
+# =========================================
+# file: src/core/asset_stream.py
+# =========================================
+"""
+AssetStreamer — background asset loading for scenes and apps.
+
+Worker threads read and decode image/sound files; the main thread then
+finishes them (convert_alpha(), registering in the shared AssetManager)
+inside a per-frame time budget, from pump() in the run loop. Scenes get
+an AssetFuture per file, or a LoadGroup with progress for a batch, and
+can draw a loading state until it is done:
+
+    self.loading = scene_manager.streamer.load_group(
+        ["assets/forest/bg.png", "assets/forest/wind.ogg"],
+        on_progress=lambda p: ..., on_done=self._assets_ready,
+    )
+
+    def draw(self, screen, dt):
+        if not self.loading.done():
+            ...  # progress bar from self.loading.progress
+
+Futures hold AssetHandles once done; release them (or the group) when
+the scene is evicted, same as handles from AssetManager.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from src.asset_manager import ASSETS, AssetManager, finish_surface
+
+_SOUND_EXTS = {".wav", ".ogg", ".mp3", ".flac"}
+
+
+class AssetFuture:
+    """Result of a streamed load. Resolved on the main thread by pump()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._handle = None
+        self._error = None
+        self._done = False
+        self._abandoned = False
+        self._callbacks = []
+
+    def done(self) -> bool:
+        return self._done
+
+    def result(self):
+        """The AssetHandle. Raises the load error, or if not done yet."""
+        if not self._done:
+            raise RuntimeError(f"Asset '{self.path}' is still loading")
+        if self._error is not None:
+            raise self._error
+        return self._handle
+
+    @property
+    def value(self):
+        """The loaded asset, or None while loading / on failure."""
+        return self._handle.value if self._handle is not None else None
+
+    def add_done_callback(self, fn):
+        if self._done:
+            fn(self)
+        else:
+            self._callbacks.append(fn)
+
+    def release(self):
+        """Drop the handle, or the pending load if it hasn't finished."""
+        if self._handle is not None:
+            self._handle.release()
+            self._handle = None
+        self._abandoned = True
+
+    def _resolve(self, handle=None, error=None):
+        if self._abandoned and handle is not None:
+            handle.release()
+            handle = None
+        self._handle = handle
+        self._error = error
+        self._done = True
+        callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception as e:
+                print(f"⚠ Asset callback failed for '{self.path}': {e}")
+
+
+class LoadGroup:
+    """A batch of AssetFutures with aggregate progress."""
+
+    def __init__(self, futures, on_progress=None, on_done=None):
+        self.futures = list(futures)
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.loaded = 0
+        if not self.futures and on_done:
+            on_done(self)
+        for future in self.futures:
+            future.add_done_callback(self._one_done)
+
+    @property
+    def progress(self) -> float:
+        return self.loaded / len(self.futures) if self.futures else 1.0
+
+    def done(self) -> bool:
+        return self.loaded >= len(self.futures)
+
+    def failed(self):
+        return [f for f in self.futures if f.done() and f._error is not None]
+
+    def values(self):
+        return [f.value for f in self.futures]
+
+    def release(self):
+        for future in self.futures:
+            future.release()
+
+    def _one_done(self, _future):
+        self.loaded += 1
+        if self.on_progress:
+            self.on_progress(self.progress)
+        if self.done() and self.on_done:
+            self.on_done(self)
+
+
+class AssetStreamer:
+    def __init__(
+        self,
+        assets: AssetManager = ASSETS,
+        workers: int = 2,
+        frame_budget_ms: float = 3.0,
+    ):
+        self.assets = assets
+        self.frame_budget_ms = frame_budget_ms
+        self._workers = workers
+        self._executor = None
+        self._ready = queue.Queue()   # decoded items waiting for the main thread
+        self._inflight = {}           # (kind, path, alpha) → [AssetFuture]
+        self._lock = threading.Lock()
+        self.stats = {
+            "requested": 0,
+            "decoded": 0,
+            "finished": 0,
+            "failed": 0,
+            "decode_seconds": 0.0,
+            "finish_seconds": 0.0,
+        }
+
+    # ------------------------------------------------------------
+    # Requests (any thread)
+    # ------------------------------------------------------------
+    def image(self, path: str, alpha: bool = True) -> AssetFuture:
+        return self._submit("surface", path, alpha)
+
+    def sound(self, path: str) -> AssetFuture:
+        return self._submit("sound", path, None)
+
+    def load(self, path: str) -> AssetFuture:
+        """Image or sound, picked by file extension."""
+        if os.path.splitext(path)[1].lower() in _SOUND_EXTS:
+            return self.sound(path)
+        return self.image(path)
+
+    def load_group(self, paths, on_progress=None, on_done=None) -> LoadGroup:
+        return LoadGroup([self.load(p) for p in paths], on_progress, on_done)
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(len(futures) for futures in self._inflight.values())
+
+    def _submit(self, kind, path, alpha):
+        future = AssetFuture(path)
+        ident = (kind, os.path.abspath(path), alpha)
+        with self._lock:
+            self.stats["requested"] += 1
+            waiting = self._inflight.get(ident)
+            if waiting is not None:
+                waiting.append(future)
+                return future
+            self._inflight[ident] = [future]
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="asset-stream"
+                )
+        self._executor.submit(self._decode, ident, path)
+        return future
+
+    # ------------------------------------------------------------
+    # Worker threads: read + decode only
+    # ------------------------------------------------------------
+    def _decode(self, ident, path):
+        kind, _abs, alpha = ident
+        start = time.perf_counter()
+        value = error = key = None
+        try:
+            if kind == "surface":
+                key = self.assets.image_key(path, alpha)
+                if key not in self.assets:
+                    value = pygame.image.load(path)
+            else:
+                key = self.assets.sound_key(path)
+                if key not in self.assets:
+                    value = pygame.mixer.Sound(path)
+        except Exception as e:
+            error = e
+        with self._lock:
+            self.stats["decode_seconds"] += time.perf_counter() - start
+        self._ready.put((ident, key, value, error))
+
+    # ------------------------------------------------------------
+    # Main thread
+    # ------------------------------------------------------------
+    def pump(self, budget_ms: float = None) -> int:
+        """
+        Finish decoded assets until the frame budget is spent (at least
+        one per call, so loading always progresses). Returns how many.
+        """
+        budget = self.frame_budget_ms if budget_ms is None else budget_ms
+        deadline = time.perf_counter() + budget / 1000.0
+        finished = 0
+        while True:
+            try:
+                item = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            self._finish(*item)
+            finished += 1
+            if time.perf_counter() >= deadline:
+                break
+        return finished
+
+    def drain(self, timeout: float = None):
+        """Block until every requested asset is finished (tests, headless)."""
+        end = None if timeout is None else time.perf_counter() + timeout
+        while self.pending():
+            remaining = None if end is None else max(0.0, end - time.perf_counter())
+            if remaining == 0.0:
+                return False
+            try:
+                item = self._ready.get(timeout=remaining)
+            except queue.Empty:
+                return False
+            self._finish(*item)
+        return True
+
+    def _finish(self, ident, key, value, error):
+        with self._lock:
+            futures = self._inflight.pop(ident, [])
+        kind, _abs, alpha = ident
+        if error is not None:
+            self.stats["failed"] += 1
+            print(f"⚠ Failed to stream asset '{ident[1]}': {error}")
+            for future in futures:
+                future._resolve(error=error)
+            return
+
+        start = time.perf_counter()
+        if value is not None:
+            self.stats["decoded"] += 1
+            if kind == "surface":
+                value = finish_surface(value, alpha)
+        for future in futures:
+            # A None value means it was already cached when the worker
+            # looked; a loader is still given in case it was evicted since.
+            if value is not None:
+                loader = lambda v=value: v
+            elif kind == "surface":
+                loader = lambda p=future.path: finish_surface(pygame.image.load(p), alpha)
+            else:
+                loader = lambda p=future.path: pygame.mixer.Sound(p)
+            future._resolve(self.assets.acquire(key, loader, kind=kind))
+        self.stats["finished"] += len(futures)
+        self.stats["finish_seconds"] += time.perf_counter() - start
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Shared streamer over the shared AssetManager; run.py pumps it each frame.
+ASSET_STREAMER = AssetStreamer(ASSETS)
@@ -0,0 +1,384 @@
+# =========================================
+# file: src/core/benchmarks.py
+# =========================================
+"""
+Headless benchmark suite for the core hot paths.
+
+    python -m src.benchmarks --out bench.json
+    python -m src.benchmarks --quick --out new.json --compare bench.json
+
+Covers GameState load/backfill (small and large saves, both codecs),
+set_flag throughput (with subscription-driven task sync), save latency
+and bytes written, next_scene_name over every Act 1 flag configuration,
+SceneManager push/pop/set (including _record_scene), and WindowManager
+handle_event/draw with N overlays. Everything runs on SDL's dummy
+drivers in a temp directory. Results are JSON; --compare prints the
+ratio per timing against an earlier run and flags regressions.
+"""
+
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+
+import pygame
+
+from src.flag_store import FLAG_REGISTRY, FlagStore
+from src.game_state import GameState
+from src.headless import init_headless
+from src.route_engine import ROUTES
+from src.scene_flow_act1 import ACT1_ROUTES, next_scene_name
+from src.scene_manager import SceneManager
+from src.scene_registry import register_scene
+from src.window_manager import WindowManager
+
+
+def _measure(fn, number: int, repeat: int = 5):
+    """Per-call timings of fn() in microseconds: best / median of `repeat` batches."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) * 1_000_000.0 / number)
+    return {"best_us": min(samples), "median_us": statistics.median(samples), "calls": number}
+
+
+# ------------------------------------------------------------
+# GameState
+# ------------------------------------------------------------
+def _make_save(path: str, large: bool, codec: str = "json"):
+    gs = GameState(path, save_codec=codec)
+    if large:
+        with gs.deferred_saves():
+            for i in range(2000):
+                gs.data["flags"][f"bench_flag_{i}"] = bool(i % 3)
+            for i in range(200):
+                gs.add_task(f"Bench task {i}")
+            gs.data["resonance_flags_seen"] = [f"bench_flag_{i}" for i in range(0, 2000, 7)]
+            gs.save()
+    gs.flush()
+    return gs
+
+
+def bench_game_state(tmp: str, scale: int):
+    results = {}
+    for size in ("small", "large"):
+        for codec in ("json", "binary"):
+            path = os.path.join(tmp, f"load_{size}_{codec}", "state.json")
+            _make_save(path, size == "large", codec)
+            size_bytes = os.path.getsize(path)
+            row = _measure(lambda: GameState(path, save_codec=codec), number=max(1, 20 * scale // (10 if size == "large" else 1)))
+            row["file_bytes"] = size_bytes
+            results[f"load_{size}_{codec}"] = row
+
+    # set_flag throughput: write-behind, no disk I/O inside the loop.
+    gs = GameState(os.path.join(tmp, "set_flag", "state.json"),
+                   write_behind=True, max_staleness=float("inf"))
+    for text in ("Join Dr. Anand’s Zoom", "Log Off", "Log Off Act 3"):
+        gs.add_task(text)
+    names = [f"bench_set_{i}" for i in range(256)] + [
+        "dr_anand_zoom_complete", "act2_logoff_complete", "act3_logoff_complete",
+    ]
+    ops = 2000 * scale
+    counter = [0]
+
+    def set_one():
+        i = counter[0] = counter[0] + 1
+        gs.set_flag(names[i % len(names)], bool(i & 1))
+
+    row = _measure(set_one, number=ops)
+    row["ops_per_s"] = 1_000_000.0 / row["median_us"]
+    results["set_flag_write_behind"] = row
+
+    # set_flag with write-through persistence (one log append per call).
+    wt = GameState(os.path.join(tmp, "set_flag_wt", "state.json"))
+    row = _measure(lambda: wt.set_flag("bench_wt", not wt.get_flag("bench_wt")), number=50 * scale)
+    row["ops_per_s"] = 1_000_000.0 / row["median_us"]
+    results["set_flag_write_through"] = row
+
+    # save() latency and bytes per snapshot.
+    for size in ("small", "large"):
+        for codec in ("json", "binary"):
+            path = os.path.join(tmp, f"save_{size}_{codec}", "state.json")
+            g = _make_save(path, size == "large", codec)
+            before = dict(g.io_stats)
+            row = _measure(g.save, number=max(1, 5 * scale))
+            snapshots = g.io_stats["snapshots"] - before["snapshots"]
+            row["bytes_per_save"] = (g.io_stats["bytes_written"] - before["bytes_written"]) / max(1, snapshots)
+            results[f"save_{size}_{codec}"] = row
+    return results
+
+
+# ------------------------------------------------------------
+# Routing
+# ------------------------------------------------------------
+class _RouteProbe:
+    """Minimal GameState stand-in: flags + act, effects are no-ops."""
+
+    def __init__(self):
+        self.data = {"act": 1, "flags": FlagStore()}
+        self.flag_epoch = 0
+
+    def set_flag(self, key, value=True):
+        pass
+
+    def set_act(self, act):
+        pass
+
+    def save(self):
+        pass
+
+
+def bench_routing(scale: int):
+    guards = sorted(ACT1_ROUTES.flag_index)
+    configs = 1 << len(guards)
+    probe = _RouteProbe()
+    masks = list(range(configs))
+    if configs > 65536:
+        masks = random.Random(0).sample(masks, 65536)
+
+    def set_config(bits):
+        flags = FlagStore()
+        for i, name in enumerate(guards):
+            if bits >> i & 1:
+                flags[name] = True
+        probe.data["flags"] = flags
+        probe.flag_epoch += 1
+
+    stores = []
+    for bits in masks:
+        set_config(bits)
+        stores.append(probe.data["flags"])
+
+    def sweep(fn):
+        for flags in stores:
+            probe.data["flags"] = flags
+            probe.flag_epoch += 1
+            fn(probe)
+
+    results = {"act1_guard_flags": len(guards), "configurations": len(stores)}
+    for label, fn in (("peek", ROUTES.peek), ("next_scene_name", next_scene_name)):
+        row = _measure(lambda: sweep(fn), number=1, repeat=max(3, scale))
+        row["per_config_us"] = row["median_us"] / len(stores)
+        results[f"act1_{label}_all_configs"] = row
+
+    # Steady state: same flags, cursor cache warm (the per-frame case).
+    set_config((1 << len(guards)) // 3)
+    results["act1_next_scene_name_warm"] = _measure(lambda: next_scene_name(probe), number=5000 * scale)
+
+    # Same sweep through the precomputed decision table (route_graph).
+    had_lookup = ACT1_ROUTES.has_lookup
+    ACT1_ROUTES.install_lookup(ACT1_ROUTES.decisions())
+    try:
+        row = _measure(lambda: sweep(next_scene_name), number=1, repeat=max(3, scale))
+        row["per_config_us"] = row["median_us"] / len(stores)
+        results["act1_next_scene_name_all_configs_lookup"] = row
+    finally:
+        if not had_lookup:
+            ACT1_ROUTES.install_lookup(None)
+    return results
+
+
+# ------------------------------------------------------------
+# SceneManager / WindowManager
+# ------------------------------------------------------------
+class _BenchScene:
+    def __init__(self, scene_manager, window_manager):
+        self.scene_manager = scene_manager
+        self.window_manager = window_manager
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def draw(self, screen, dt):
+        screen.fill((20, 20, 30))
+
+
+class _BenchSceneB(_BenchScene):
+    pass
+
+
+class _BenchOverlay:
+    is_overlay = True
+    hit_test_mouse = True
+
+    def __init__(self, window_manager, x=0, y=0):
+        self.rect = pygame.Rect(x, y, 120, 80)
+        self.dirty = True
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def draw(self, screen, dt):
+        pygame.draw.rect(screen, (200, 200, 220), self.rect)
+
+
+def bench_scene_manager(tmp: str, scale: int):
+    register_scene("bench/scene_a", _BenchScene)
+    register_scene("bench/scene_b", _BenchSceneB)
+    screen = pygame.display.get_surface()
+    gs = GameState(os.path.join(tmp, "scenes", "state.json"), write_behind=True)
+    sm = SceneManager()
+    wm = WindowManager(screen, state=gs)
+    wm.game_state = gs
+    a, b = _BenchScene(sm, wm), _BenchSceneB(sm, wm)
+    sm.set(a)
+
+    def push_pop():
+        sm.push(b)
+        sm.pop()
+
+    flip = [a, b]
+
+    def set_scene():
+        flip.reverse()
+        sm.set(flip[0])
+
+    results = {
+        "push_pop_record_scene": _measure(push_pop, number=50 * scale),
+        "set_record_scene": _measure(set_scene, number=50 * scale),
+    }
+    sm.layered = True
+    results["push_pop_layered"] = _measure(push_pop, number=20 * scale)
+    return results
+
+
+def bench_window_manager(scale: int, overlay_counts=(0, 8, 32, 128)):
+    screen = pygame.display.get_surface()
+    w, h = screen.get_size()
+    rng = random.Random(1)
+    events = []
+    for i in range(200):
+        pos = (rng.randrange(w), rng.randrange(h))
+        kind = i % 4
+        if kind == 0:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+        elif kind == 1:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode="a"))
+        else:
+            events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(1, 1), buttons=(0, 0, 0)))
+
+    results = {}
+    for n in overlay_counts:
+        for retained in (False, True):
+            wm = WindowManager(screen, retained=retained)
+            for i in range(n):
+                wm.open(_BenchOverlay, {"x": (i * 37) % (w - 120), "y": (i * 53) % (h - 80)})
+
+            def dispatch():
+                for event in events:
+                    wm.handle_event(event)
+                wm.flush_motion()
+
+            def draw():
+                wm.draw(screen, 1.0 / 60.0)
+                wm.take_frame_rects()
+
+            mode = "retained" if retained else "immediate"
+            if not retained:
+                row = _measure(dispatch, number=max(1, 2 * scale))
+                row["per_event_us"] = row["median_us"] / len(events)
+                results[f"handle_event_{n}_overlays"] = row
+            results[f"draw_{n}_overlays_{mode}"] = _measure(draw, number=10 * scale)
+    return results
+
+
+# ------------------------------------------------------------
+# Runner
+# ------------------------------------------------------------
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(scale: int = 5, only=None):
+    screen_size = (1280, 720)
+    init_headless(screen_size)
+    tmp = tempfile.mkdtemp(prefix="bench_")
+    suites = {
+        "game_state": lambda: bench_game_state(tmp, scale),
+        "routing": lambda: bench_routing(scale),
+        "scene_manager": lambda: bench_scene_manager(tmp, scale),
+        "window_manager": lambda: bench_window_manager(scale),
+    }
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "scale": scale,
+            "flag_registry_size": len(FLAG_REGISTRY),
+        },
+        "results": {},
+    }
+    try:
+        for name, fn in suites.items():
+            if only and name not in only:
+                continue
+            start = time.perf_counter()
+            report["results"][name] = fn()
+            print(f"[Bench] {name}: {time.perf_counter() - start:.2f}s")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return report
+
+
+def compare(new: dict, old: dict, threshold: float = 1.15):
+    """Rows of (metric, old µs, new µs, ratio) for every median timing; ratio > threshold is a regression."""
+    rows = []
+    for suite, cases in new.get("results", {}).items():
+        for case, row in cases.items():
+            if not isinstance(row, dict) or "median_us" not in row:
+                continue
+            before = old.get("results", {}).get(suite, {}).get(case)
+            if not isinstance(before, dict) or not before.get("median_us"):
+                continue
+            ratio = row["median_us"] / before["median_us"]
+            rows.append((f"{suite}.{case}", before["median_us"], row["median_us"], ratio, ratio > threshold))
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Headless core benchmarks")
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--scale", type=int, default=5, help="work multiplier")
+    parser.add_argument("--quick", action="store_true", help="same as --scale 1")
+    parser.add_argument("--only", nargs="*", help="suites to run")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.15)
+    args = parser.parse_args()
+
+    report = run_suite(1 if args.quick else args.scale, args.only)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[Bench] Wrote {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = 0
+        for metric, before, after, ratio, worse in compare(report, baseline, args.threshold):
+            mark = "  ⚠ regression" if worse else ""
+            regressions += worse
+            print(f"{metric:<48} {before:10.2f} → {after:10.2f} µs  x{ratio:4.2f}{mark}")
+        print(f"[Bench] {regressions} regression(s) vs {args.compare}")
@@ -0,0 +1,227 @@
+# =========================================
+# file: src/core/flag_store.py
+# =========================================
+"""
+Compact, interned storage for GameState progression flags.
+
+Almost every flag is a boolean, so FlagStore keeps them in two Python
+ints used as bitsets (which flags are present, which are truthy) with
+slot numbers handed out by a shared FlagRegistry. The few non-boolean
+flags (e.g. "act4_route") live in a small side table. FlagStore is a
+MutableMapping, so existing code that does data["flags"].get(...) or
+data["flags"][key] = value keeps working unchanged.
+
+Multi-flag checks become a single mask test:
+    mask = FLAG_REGISTRY.mask(["timothy_zoom_complete", "beatrice_zoom_complete"])
+    flags.all_set(mask)
+
+On disk the store is written as space-separated name lists instead of
+one "name": bool line per flag:
+    {"__flagset__": 1, "on": "a b", "off": "c d", "values": {"act4_route": "unknown"}}
+Plain {name: value} dicts from older saves are still accepted.
+
+FlagStore.version is bumped whenever a flag turns off or is removed,
+however it is written (set_flag() or data["flags"][key] = False). Caches
+that assume flags only ever turn on, such as route cursors, key on it.
+"""
+
+import sys
+from collections.abc import MutableMapping
+
+
+class FlagRegistry:
+    """Maps flag names to stable (per process) integer slots."""
+
+    def __init__(self, names=()):
+        self._slots = {}
+        self._names = []
+        for name in names:
+            self.slot(name)
+
+    def slot(self, name: str) -> int:
+        slot = self._slots.get(name)
+        if slot is None:
+            name = sys.intern(name)
+            slot = len(self._names)
+            self._slots[name] = slot
+            self._names.append(name)
+        return slot
+
+    def lookup(self, name):
+        """Slot for name, or None if it has never been registered."""
+        return self._slots.get(name)
+
+    def name(self, slot: int) -> str:
+        return self._names[slot]
+
+    def mask(self, names) -> int:
+        mask = 0
+        for name in names:
+            mask |= 1 << self.slot(name)
+        return mask
+
+    def __len__(self):
+        return len(self._names)
+
+
+# Shared by every FlagStore so masks can be computed once at import time.
+FLAG_REGISTRY = FlagRegistry()
+
+
+def _iter_slots(bits: int):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class FlagStore(MutableMapping):
+    __slots__ = ("_registry", "_present", "_truth", "_other", "version")
+
+    def __init__(self, initial=None, registry: FlagRegistry = FLAG_REGISTRY):
+        self._registry = registry
+        self._present = 0   # slots holding a boolean
+        self._truth = 0     # slots whose value is truthy (bool or not)
+        self._other = {}    # non-boolean values
+        self.version = 0    # bumped when a flag turns off or is removed
+        if initial:
+            for key, value in initial.items():
+                self[key] = value
+
+    # ------------------------------------------------------------
+    # Mapping protocol
+    # ------------------------------------------------------------
+    def __getitem__(self, key):
+        other = self._other
+        if other and key in other:
+            return other[key]
+        slot = self._registry.lookup(key)
+        if slot is None or not (self._present >> slot) & 1:
+            raise KeyError(key)
+        return bool((self._truth >> slot) & 1)
+
+    def get(self, key, default=None):
+        other = self._other
+        if other and key in other:
+            return other[key]
+        slot = self._registry.lookup(key)
+        if slot is None or not (self._present >> slot) & 1:
+            return default
+        return bool((self._truth >> slot) & 1)
+
+    def __setitem__(self, key, value):
+        bit = 1 << self._registry.slot(key)
+        if type(value) is bool:
+            if self._other:
+                self._other.pop(key, None)
+            self._present |= bit
+        else:
+            self._other[key] = value
+            self._present &= ~bit
+        if value:
+            self._truth |= bit
+        elif self._truth & bit:
+            self._truth &= ~bit
+            self.version += 1
+
+    def __delitem__(self, key):
+        slot = self._registry.lookup(key)
+        if key in self._other:
+            del self._other[key]
+        elif slot is None or not (self._present >> slot) & 1:
+            raise KeyError(key)
+        if slot is not None:
+            bit = 1 << slot
+            self._present &= ~bit
+            self._truth &= ~bit
+        self.version += 1
+
+    def __contains__(self, key):
+        if key in self._other:
+            return True
+        slot = self._registry.lookup(key)
+        return slot is not None and bool((self._present >> slot) & 1)
+
+    def __iter__(self):
+        names = self._registry.name
+        for slot in _iter_slots(self._present):
+            yield names(slot)
+        yield from list(self._other)
+
+    def __len__(self):
+        return bin(self._present).count("1") + len(self._other)
+
+    def __repr__(self):
+        return f"FlagStore({dict(self.items())!r})"
+
+    # ------------------------------------------------------------
+    # Bitset helpers
+    # ------------------------------------------------------------
+    def mask(self, *names) -> int:
+        return self._registry.mask(names)
+
+    def all_set(self, mask: int) -> bool:
+        """True if every flag in mask is truthy."""
+        return self._truth & mask == mask
+
+    def any_set(self, mask: int) -> bool:
+        return bool(self._truth & mask)
+
+    def truth_bits(self, mask: int) -> int:
+        """The truthy flags within mask, as slot bits (e.g. a lookup key)."""
+        return self._truth & mask
+
+    def copy(self):
+        clone = FlagStore.__new__(FlagStore)
+        clone._registry = self._registry
+        clone._present = self._present
+        clone._truth = self._truth
+        clone._other = dict(self._other)
+        clone.version = self.version
+        return clone
+
+    # ------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------
+    def to_json(self):
+        on, off = [], []
+        values = dict(self._other)
+        names = self._registry.name
+        for slot in _iter_slots(self._present):
+            name = names(slot)
+            if not name or any(c.isspace() for c in name):
+                values[name] = bool((self._truth >> slot) & 1)
+            elif (self._truth >> slot) & 1:
+                on.append(name)
+            else:
+                off.append(name)
+        return {
+            "__flagset__": 1,
+            "on": " ".join(on),
+            "off": " ".join(off),
+            "values": values,
+        }
+
+    @classmethod
+    def from_json(cls, obj, registry: FlagRegistry = FLAG_REGISTRY):
+        """Build a store from either the compact form or a plain dict."""
+        if isinstance(obj, FlagStore):
+            return obj
+        obj = obj or {}
+        if not obj.get("__flagset__"):
+            return cls(obj, registry)
+
+        store = cls(registry=registry)
+        for name in obj.get("on", "").split():
+            store[name] = True
+        for name in obj.get("off", "").split():
+            store[name] = False
+        for name, value in obj.get("values", {}).items():
+            store[name] = value
+        return store
+
+
+def adopt_flags(data: dict):
+    """Replace data["flags"] (plain or compact JSON form) with a FlagStore."""
+    data["flags"] = FlagStore.from_json(data.get("flags"))
+    return data
@@ -3,32 +3,127 @@
 # =========================================
 """
 GameState: manages player progress, flags, trust, tasks, and persistence.
-Integrated with JSON save system in /save/state.json.
+Integrated with JSON save system in /save/state.json (or the binary
+format from save_codec.py; either one loads transparently).
+Small changes go to an append-only delta log (/save/state.json.log)
+that is compacted back into the snapshot once it grows too large.
 """
 
-import json
+import fnmatch
 import os
+import struct
+import time
+from contextlib import contextmanager
+
+from src.flag_store import FLAG_REGISTRY, FlagStore, adopt_flags
+from src.save_migrations import migrate
+from src.save_codec import get_codec, read_save
+from src.task_list import TaskList, adopt_tasks
+from src.save_journal import (
+    append_records,
+    atomic_write_bytes,
+    log_size,
+    read_records,
+    replay,
+    truncate_log,
+)
+
+
+# Marks "no previous value" in undo entries and change diffs.
+_MISSING = object()
+
+# Flags that complete a task when they turn on (Act 2 / Act 3 task lists).
+# Each one is subscribed per GameState, so only changed flags are checked.
+_FLAG_TASKS = {
+    "dr_anand_zoom_complete": "Join Dr. Anand’s Zoom",
+    "anand_assignment_complete": "Complete Anand's Assignment",
+    "dr_rachel_zoom_complete": "Join Dr. Rachel’s Zoom",
+    "rachel_assignment_complete": "Complete Rachel’s Assignment",
+    "act2_logoff_complete": "Log Off",
+    "lottie_lab_intro_complete": "Prepare for Night Mission",
+    "timothy_zoom3_complete": "Join Dr. Timothy's Zoom 3",
+    "timothy_assignment_complete": "Complete Timothy's Assignment",
+    "beatrice_zoom3_complete": "Join Dr. Beatrice's Zoom 3",
+    "act3_logoff_complete": "Log Off Act 3",
+}
+
+# Bitmask of the Act 1 beats checked by all_tasks_complete().
+_ACT1_CORE_MASK = FLAG_REGISTRY.mask([
+    "timothy_zoom_complete",
+    "lottie_assignment1_complete",
+    "beatrice_zoom_complete",
+    "lottie_assignment2_complete",
+])
 
 
 class GameState:
-    def __init__(self, save_file: str = "save/state.json"):
+    def __init__(
+        self,
+        save_file: str = "save/state.json",
+        write_behind: bool = False,
+        max_staleness: float = 2.0,
+        log_compact_bytes: int = 64 * 1024,
+        slot_index=None,
+        slot: int = None,
+        save_codec="json",
+    ):
         self.save_file = save_file
+        # Snapshot format for writes ("json" / "binary"); reads detect it.
+        self.codec = get_codec(save_codec)
+        # Save slots (see save_slots.SaveSlots): the slot's summary record
+        # in the shared index is refreshed on every write.
+        self.slot_index = slot_index
+        self.slot = slot
+        self.log_file = save_file + ".log"
+        self.log_compact_bytes = log_compact_bytes
+        # Write-behind: save() only marks the state dirty; the game loop
+        # flushes once per frame (end_frame), on scene transition, or via
+        # flush(). Without end_frame(), max_staleness bounds how long dirty
+        # state sits unwritten only when another mutation comes along (that
+        # is where it is checked); an idle process still needs flush() or
+        # end_frame() to write its last change. Reads never touch the disk.
+        self.write_behind = write_behind
+        self.max_staleness = max_staleness
+        self._dirty = False
+        self._dirty_since = None
+        self._defer_depth = 0
+        self._pending_log = []
+        self._snapshot_pending = False
+        # Open transaction(): [(record, old value)] in order, else None.
+        self._txn = None
+        self._change_listeners = []
+        # Flag observers: exact name → [callback], plus fnmatch patterns.
+        self._subscribers = {}
+        self._pattern_subscribers = []
+        self._pattern_cache = {}
+        # Optional mutation recorder (save_replay.EventRecorder): gets
+        # emit(record) for every committed journal record, and
+        # {"op": "load"} / {"op": "reset"} when the whole state is replaced.
+        self.event_sink = None
+        for flag in _FLAG_TASKS:
+            self.subscribe(flag, self._complete_flag_task)
+        # Bumped when a flag is cleared or the state is reloaded, so caches
+        # that assume flags only turn on (route cursors) can revalidate.
+        self.flag_epoch = 0
+        # Cumulative persistence counters (read by the frame profiler).
+        self.io_stats = {"snapshots": 0, "log_appends": 0, "bytes_written": 0}
         self.data = self._load_or_init()
-        self._ensure_flags()  # ensure new flags exist in older saves
-        self._ensure_resonance_data()
-        self._ensure_scene_tracking()
+        self._apply_migrations()  # only pending ones; no-op for current saves
 
     # ------------------------------------------------------------
     # Load or create new state
     # ------------------------------------------------------------
     def _load_or_init(self):
         """Load state from file, or create a new one if missing."""
-        if os.path.exists(self.save_file):
-            try:
-                with open(self.save_file, "r") as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"⚠ Failed to load save: {e}")
+        data = self._read_snapshot() if os.path.exists(self.save_file) else None
+        if data is not None:
+            if os.path.exists(self.log_file):
+                # Replay, then fold the log back into the snapshot so a
+                # torn tail from a crash never gets appended onto. Write
+                # errors propagate: the save on disk is still good.
+                replay(data, read_records(self.log_file))
+                self._save_data(data)
+            return data
 
         # Default player name (fallback safe for sandbox/headless)
         try:
@@ -48,7 +143,7 @@ class GameState:
             "last_scene": None,
             "settings": {"flash_effects": True},
             "flags": {
-                # Minimal seed; _ensure_flags() will fill the rest.
+                # Minimal seed; save_migrations backfills the rest.
                 "pink_channel_synced": False
             },
             "tasks": [
@@ -60,160 +155,67 @@ class GameState:
             ],
         }
 
+        adopt_flags(data)
         self._save_data(data)
         return data
 
+    def _read_snapshot(self):
+        """Decode the snapshot; None if it is damaged (moved aside first)."""
+        try:
+            data, _codec = read_save(self.save_file)
+            if not isinstance(data, dict):
+                raise ValueError("save is not a JSON object")
+            adopt_flags(data)
+            return data
+        except (ValueError, struct.error, IndexError, TypeError, AttributeError) as e:
+            print(f"⚠ Failed to load save: {e}")
+
+        # Keep the damaged file around instead of overwriting it with a
+        # fresh game; each one gets its own name so older backups survive.
+        backup = f"{self.save_file}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+        candidate, n = backup, 1
+        while os.path.exists(candidate):
+            candidate = f"{backup}-{n}"
+            n += 1
+        try:
+            os.replace(self.save_file, candidate)
+            print(f"⚠ Moved damaged save to {candidate}")
+        except OSError:
+            pass
+        return None
+
     def load(self):
         """Compatibility wrapper so older scenes can call gs.load()."""
+        self.flag_epoch += 1
         self.data = self._load_or_init()
-        self._ensure_flags()
-        self._ensure_resonance_data()
-        self._ensure_scene_tracking()
+        self._apply_migrations()
+        self._emit_baseline("load")
+
+    def _emit_baseline(self, op: str):
+        """Tell the event recorder the whole state was replaced."""
+        if self.event_sink is not None:
+            self.event_sink.emit({"op": op})
 
     # ------------------------------------------------------------
-    # Ensure flags exist in old saves
+    # Bring old saves up to date
     # ------------------------------------------------------------
-    def _ensure_flags(self):
-        """Backfill any newly-added flags so older saves don't break."""
-        flags = self.data.setdefault("flags", {})
-
-        # Core scene/app flags used throughout Acts 1–2 (and some later hooks)
-        defaults = {
-            # Lottie mission flow (Act 1)
-            "lottie_home_waiting": False,
-            "lottie_admin_assigned": False,
-            "lottie_home_sequence_complete": False,
-            "lottie_home_denied": False,
-            "pink_channel_synced": flags.get("pink_channel_synced", False),
-
-            # Lottie post-mission (Act 1)
-            "lottie_post_qna_complete": False,
-            "lottie_post_mission_greeted": False,
-            "lottie_creepy_event_done": False,
-
-            # Zooms (Act 1)
-            "timothy_zoom_complete": False,
-            "beatrice_zoom_complete": False,
-
-            # Assignments (Act 1)
-            "lottie_assignment1_complete": False,
-            "lottie_assignment2_complete": False,
-
-            # Desktop UX bits
-            "desktop_intro_shown": False,
-            "portal_reminder_shown": False,
-
-            # Misc discoveries / easter eggs
-            "terminal_388_found": False,
-            "hallway_freechat_typed": False,
-            "stain_discovered": False,
-            "stain_lottie_chat_done": False,
-
-            # --- NEW FLAGS FOR ACT 1 FLOW ---
-            "bluebird_complete": False,
-            "dorm_after_bluebird_complete": False,
-            "bluebird_signal_detected": False,
-            "act1_fast_forward": False,
-
-            # Hallway stealth sequence
-            "hallway_game_complete": False,   # main
-            "hallway_completed": False,       # legacy compatibility
-
-            # Control room
-            "control_room_complete": False,
-
-            # Admin desktop / narrative progression
-            "admin_intro_shown": False,
-            "admin_lottie_autostarted": False,
-            "dorm_brainmap_cache_received": False,
-            "neuroscan_unlocked": False,
-            "memory_core_downloaded": False,
-
-            # Lab / night mission hook
-            "lab_signal_relay_complete": flags.get("lab_signal_relay_complete", False),
-
-            # Lux console channels
-            "lux_channel2_shown": False,
-            "lux_channel3_shown": False,
-            "lux_channel2_unlocked": False,
-            "lux_channel3_unlocked": False,
-
-            # Hangman lock / Neuroscan
-            "hangman_lock_solved": False,
-
-            # --- Act 2 flags ---
-            "talked_to_lottie_prezoom": False,
-            "dr_anand_zoom_complete": False,
-            "anand_suspicious": False,
-            "anand_assignment_complete": False,
-            "lottie_override_anand_question": False,
-
-            "dr_rachel_zoom_complete": False,
-            "rachel_assignment_complete": False,
-            "rachel_suspicious": False,
-
-            # Act 2 logoff + night mission
-            "act2_logoff_complete": False,
-            "lottie_lab_intro_complete": False,
-            "act2_night_mission_complete": False,
-            "act2_complete": False,
-
-            # Post-lab, Lottie update & dreams
-            "lottie_update2_complete": False,
-            "charlotte_dream_complete": False,
-
-            # --- Act 3 flags ---
-            # Lottie intro variants
-            "act3_lottie_intro_seen": False,
-            "act3_lottie_intro_locked": False,
-            "act3_lottie_intro_lowtrust_seen": False,
-            "desktop_act3_intro_shown": False,
-
-            # Zoom 3 completions
-            "timothy_zoom3_complete": False,
-            "beatrice_zoom3_complete": False,
-            "timothy_assignment_complete": False,
-
-            # Suspicion flags for all four profs (used in logoff router)
-            "timothy_suspicious": False,
-            "beatrice_suspicious": False,
-            # anand_suspicious / rachel_suspicious already defined above
-
-            # Logoff and betrayal
-            "act3_safe_logoff": False,
-            "act3_betrayal": False,
-            "act3_logoff_complete": False,
-            "act3_normal_logoff": False,
-            "force_interrogation": False,
-            "lottie_instruction_started" : False,
-            "lottie_instruction_complete" : False,
-            "act3_metaforest_started": False,
-            "act3_metaforest_complete": False,
-            "act3_channel3_flow_pending": False,
-            "act3_channel3_exit_ready": False,
-
-            # One-time bonuses / bookkeeping
-            "act2_trust_bonus_granted": False,
-
-            # --- Act 4 stable route flags ---
-            "act4_route": "unknown",
-            "act4_route_stable": False,
-            "act4_route_corrupted": False,
-            "act4_corrupted_reason": "",
-            "act4_lottie_stable_confirmed": False,
-            "act4_timothy_zoom4_complete": False,
-            "act4_beatrice_zoom4_complete": False,
-            "act4_optional_assignment_complete": False,
-            "act4_checkin_complete": False,
-            "act4_complete": False,
-            "act4_end_unlocked": False,
-        }
+    def _apply_migrations(self):
+        """
+        Bring the loaded save up to SCHEMA_VERSION, running only the
+        migrations it hasn't seen yet (none for a current save), then the
+        cheap progress fixups that depend on flags rather than schema.
+        """
+        changed = bool(migrate(self.data))
+        if self._reconcile_progress() or changed:
+            self.save()
 
+    def _reconcile_progress(self):
+        """
+        State-dependent fixups that must run on every load, because the
+        flags they look at can change during play. All O(1).
+        """
+        flags = self.data.setdefault("flags", {})
         changed = False
-        for k, v in defaults.items():
-            if k not in flags:
-                flags[k] = v
-                changed = True
 
         # Backfill hallway completion only if the glitch event already happened.
         if flags.get("hallway_glitch"):
@@ -249,29 +251,13 @@ class GameState:
                 if not flags.get(k):
                     flags[k] = True
                     changed = True
-        # Ensure Act 3 tasks exist when entering Act 3+
-        tasks_changed = self._ensure_act3_tasks() or self._ensure_act4_tasks()
-
-        if changed or tasks_changed:
-            self.save()
-
-    def _ensure_resonance_data(self):
-        """Backfill resonance keys for older saves."""
-        changed = False
-        if "resonance" not in self.data:
-            self.data["resonance"] = 0
-            changed = True
-        if "resonance_flags_seen" not in self.data:
-            self.data["resonance_flags_seen"] = []
-            changed = True
-        if changed:
-            self.save()
-
-    def _ensure_scene_tracking(self):
-        """Backfill scene tracking key for older saves."""
-        if "last_scene" not in self.data:
-            self.data["last_scene"] = None
-            self.save()
+        # Ensure the act's task list exists (Act 4 objectives replace Act 3's;
+        # running both let the two lists swap on every other load).
+        if self.data.get("act", 1) >= 4:
+            tasks_changed = self._ensure_act4_tasks()
+        else:
+            tasks_changed = self._ensure_act3_tasks()
+        return changed or tasks_changed
 
     def _ensure_act3_tasks(self):
         """
@@ -283,19 +269,12 @@ class GameState:
         if act < 3:
             return False
 
-        tasks = []
-        def add(text, done):
-            tasks.append({"text": text, "done": bool(done)})
-
-        add("Join Dr. Timothy's Zoom 3", self.get_flag("timothy_zoom3_complete"))
-        add("Complete Timothy's Assignment", self.get_flag("timothy_assignment_complete"))
-        add("Join Dr. Beatrice's Zoom 3", self.get_flag("beatrice_zoom3_complete"))
-        add("Log Off Act 3", self.get_flag("act3_logoff_complete"))
-
-        changed = tasks != self.data.get("tasks")
-        if changed:
-            self.data["tasks"] = tasks
-        return changed
+        return self._sync_task_list([
+            ("Join Dr. Timothy's Zoom 3", self.get_flag("timothy_zoom3_complete")),
+            ("Complete Timothy's Assignment", self.get_flag("timothy_assignment_complete")),
+            ("Join Dr. Beatrice's Zoom 3", self.get_flag("beatrice_zoom3_complete")),
+            ("Log Off Act 3", self.get_flag("act3_logoff_complete")),
+        ])
 
     def _ensure_act4_tasks(self):
         """
@@ -306,44 +285,347 @@ class GameState:
         if act < 4:
             return False
 
-        tasks = []
-        def add(text, done):
-            tasks.append({"text": text, "done": bool(done)})
-
-        add("Check on Lottie (Act 4 start)", self.get_flag("act4_lottie_stable_confirmed"))
-        add("Join Dr. Timothy's Zoom 4", self.get_flag("act4_timothy_zoom4_complete"))
-        add("Join Dr. Beatrice's Zoom 4", self.get_flag("act4_beatrice_zoom4_complete"))
-        add("Complete optional assignment", self.get_flag("act4_optional_assignment_complete"))
-        add("Finish Act 4 day", self.get_flag("act4_complete"))
+        return self._sync_task_list([
+            ("Check on Lottie (Act 4 start)", self.get_flag("act4_lottie_stable_confirmed")),
+            ("Join Dr. Timothy's Zoom 4", self.get_flag("act4_timothy_zoom4_complete")),
+            ("Join Dr. Beatrice's Zoom 4", self.get_flag("act4_beatrice_zoom4_complete")),
+            ("Complete optional assignment", self.get_flag("act4_optional_assignment_complete")),
+            ("Finish Act 4 day", self.get_flag("act4_complete")),
+        ])
 
-        changed = tasks != self.data.get("tasks")
-        if changed:
-            self.data["tasks"] = tasks
-        return changed
+    def _sync_task_list(self, spec):
+        """
+        Make the task list exactly spec [(text, done)], comparing in place
+        and only building a new list when something differs.
+        """
+        tasks = self.data.get("tasks") or []
+        if len(tasks) == len(spec) and all(
+            t.get("text") == text and t.get("done") == bool(done)
+            for t, (text, done) in zip(tasks, spec)
+        ):
+            return False
+        self.data["tasks"] = TaskList(
+            {"text": text, "done": bool(done)} for text, done in spec
+        )
+        return True
 
     # ------------------------------------------------------------
     # Persistence
     # ------------------------------------------------------------
     def save(self):
+        """
+        Persist the full state as a snapshot.
+        In write-behind mode (or inside deferred_saves()) this only marks
+        the state dirty; the actual write happens in flush().
+        """
+        self._snapshot_pending = True
+        if self.event_sink is not None and self._txn is None:
+            self.event_sink.emit({"op": "snapshot"})
+        self._persist()
+
+    def _set(self, path, value):
+        """Assign data[path...] = value and record it (keeps the old value for undo/diffs)."""
+        *parents, leaf = path
+        target = self.data
+        for key in parents:
+            target = target.setdefault(key, {})
+        old = target.get(leaf, _MISSING)
+        target[leaf] = value
+        self._record("set", path, value, old=old)
+
+    def _record(self, op: str, path=None, value=None, text=None, old=_MISSING):
+        """
+        Queue a small delta record for a change already applied to
+        self.data. Costs O(size of the change) instead of a full rewrite.
+        """
+        record = {"op": op}
+        if path is not None:
+            record["path"] = list(path)
+            record["value"] = value
+        if text is not None:
+            record["text"] = text
+        self._pending_log.append(record)
+        if self._txn is not None:
+            self._txn.append((record, old))
+            self._persist()
+            return
+        if self.event_sink is not None:
+            self.event_sink.emit(record)
+        self._persist()
+        if self._subscribers or self._pattern_subscribers or self._change_listeners:
+            diff = _diff([(record, old)])
+            self._dispatch(diff)
+            self._notify(diff)
+
+    def _persist(self):
+        now = time.monotonic()
+        if not self._dirty:
+            self._dirty = True
+            self._dirty_since = now
+
+        if self._txn is not None:
+            return  # written once, when the transaction commits
+        if not (self.write_behind or self._defer_depth):
+            self.flush()
+        else:
+            self._flush_if_stale(now)
+
+    def _flush_if_stale(self, now=None):
+        """Flush when dirty state is older than max_staleness."""
+        if not self._dirty or self._txn is not None:
+            return False
+        if now is None:
+            now = time.monotonic()
+        if now - self._dirty_since >= self.max_staleness:
+            return self.flush()
+        return False
+
+    def flush(self):
+        """Write pending changes to disk. Returns True if a write happened."""
+        if not self._dirty or self._txn is not None:
+            return False
+        if self._snapshot_pending:
+            self._save_data(self.data)
+        else:
+            written = append_records(self.log_file, self._pending_log)
+            self.io_stats["log_appends"] += 1
+            self.io_stats["bytes_written"] += written
+            if log_size(self.log_file) >= self.log_compact_bytes:
+                self.compact()
+            else:
+                self._update_slot_summary(self.data)
+        self._clear_dirty()
+        if self.event_sink is not None:
+            self.event_sink.flush()
+        return True
+
+    def compact(self):
+        """Fold the delta log into a fresh snapshot."""
         self._save_data(self.data)
 
+    def end_frame(self):
+        """Called once per frame by the main loop; flushes any pending save."""
+        return self.flush()
+
+    def is_dirty(self):
+        return self._dirty
+
+    @contextmanager
+    def deferred_saves(self):
+        """
+        Batch several mutations into a single write:
+            with self.state.deferred_saves():
+                self.state.set_flag("a")
+                self.state.change_trust(+0.1)
+        Flushes once on exit (outermost block only).
+        """
+        self._defer_depth += 1
+        try:
+            yield self
+        finally:
+            self._defer_depth -= 1
+            if not self._defer_depth and not self.write_behind:
+                self.flush()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Apply a group of mutations as one unit:
+            with self.state.transaction():
+                self.state.set_flag("act3_betrayal", True)
+                self.state.change_trust(-0.5)
+        At commit, values are validated once and flag subscribers run once
+        per changed flag (their own mutations join the transaction); then
+        the state is persisted once and change listeners get one diff.
+        If the block (or validation) raises, every change made through
+        GameState's mutators is rolled back. Nested blocks join the
+        outermost one.
+        """
+        if self._txn is not None:
+            yield self
+            return
+
+        self._txn = []
+        log_start = len(self._pending_log)
+        # Restored on rollback, so an aborted block leaves nothing to flush.
+        saved_flags = (self._dirty, self._dirty_since, self._snapshot_pending)
+        self._defer_depth += 1
+        committed = None
+        try:
+            yield self
+            checked = 0
+            while checked < len(self._txn):
+                batch = self._txn[checked:]
+                checked = len(self._txn)
+                self._validate(batch)
+                self._dispatch(_diff(batch))
+            committed = self._txn
+        except BaseException:
+            self._rollback(self._txn)
+            del self._pending_log[log_start:]
+            self._dirty, self._dirty_since, self._snapshot_pending = saved_flags
+            raise
+        finally:
+            self._txn = None
+            self._defer_depth -= 1
+            if not self._defer_depth and not self.write_behind:
+                self.flush()
+            elif self._dirty:
+                self._persist()  # staleness bound still applies
+        if committed:
+            if self.event_sink is not None:
+                for record, _old in committed:
+                    self.event_sink.emit(record)
+            self._notify(_diff(committed))
+
+    def _validate(self, entries):
+        for record, _old in entries:
+            if "value" in record and not self._is_json_safe(record["value"]):
+                raise TypeError(
+                    f"[GameState] transaction rejected non-JSON value at "
+                    f"{'.'.join(map(str, record['path']))}: "
+                    f"{type(record['value']).__name__}"
+                )
+
+    def _rollback(self, entries):
+        """Undo transaction entries, newest first."""
+        self.flag_epoch += 1
+        for record, old in reversed(entries):
+            op = record["op"]
+            if op == "set":
+                *parents, leaf = record["path"]
+                target = self.data
+                for key in parents:
+                    target = target.setdefault(key, {})
+                if old is _MISSING:
+                    target.pop(leaf, None)
+                else:
+                    target[leaf] = old
+            elif op == "add":
+                *parents, leaf = record["path"]
+                target = self.data
+                for key in parents:
+                    target = target.get(key, {})
+                items = target.get(leaf, [])
+                if record["value"] in items:
+                    items.remove(record["value"])
+            elif op == "task_add":
+                self.tasks().remove_text(record["text"])
+            elif op == "task_done":
+                self.tasks().reopen(record["text"])
+
+    # ------------------------------------------------------------
+    # Change notifications
+    # ------------------------------------------------------------
+    def add_change_listener(self, callback):
+        """
+        callback(diff) runs after every committed change: once per
+        transaction, or once per mutation outside one. diff maps a path
+        tuple (("flags", "x"), ("trust",), ("tasks", text)) to (old, new);
+        old is None for keys that did not exist.
+        """
+        self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback):
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def subscribe(self, flag_or_pattern: str, callback):
+        """
+        Call callback(flag, old, new) whenever a flag's value changes:
+            state.subscribe("act3_betrayal", self._on_betrayal)
+            state.subscribe("*_zoom_complete", self._refresh_icons)
+        Patterns use fnmatch syntax. Inside a transaction, subscribers
+        run at commit with the net change. Returns an unsubscribe function.
+        """
+        if any(c in flag_or_pattern for c in "*?["):
+            entry = (flag_or_pattern, callback)
+            self._pattern_subscribers.append(entry)
+            self._pattern_cache.clear()
+
+            def unsubscribe():
+                if entry in self._pattern_subscribers:
+                    self._pattern_subscribers.remove(entry)
+                    self._pattern_cache.clear()
+        else:
+            callbacks = self._subscribers.setdefault(flag_or_pattern, [])
+            callbacks.append(callback)
+
+            def unsubscribe():
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if not callbacks and self._subscribers.get(flag_or_pattern) is callbacks:
+                    del self._subscribers[flag_or_pattern]
+        return unsubscribe
+
+    def _dispatch(self, diff):
+        """Run flag subscribers for the flags in diff."""
+        for path, (old, new) in diff.items():
+            if len(path) != 2 or path[0] != "flags":
+                continue
+            flag = path[1]
+            callbacks = self._subscribers.get(flag, ())
+            if self._pattern_subscribers:
+                matched = self._pattern_cache.get(flag)
+                if matched is None:
+                    matched = self._pattern_cache[flag] = [
+                        cb for pattern, cb in self._pattern_subscribers
+                        if fnmatch.fnmatchcase(flag, pattern)
+                    ]
+                callbacks = list(callbacks) + matched
+            for callback in list(callbacks):
+                try:
+                    callback(flag, old, new)
+                except Exception as e:
+                    print(f"⚠ GameState subscriber for '{flag}' failed: {e}")
+
+    def _notify(self, diff):
+        if not self._change_listeners or not diff:
+            return
+        for callback in list(self._change_listeners):
+            try:
+                callback(diff)
+            except Exception as e:
+                print(f"⚠ GameState change listener failed: {e}")
+
+    def _clear_dirty(self):
+        self._dirty = False
+        self._dirty_since = None
+        self._pending_log = []
+        self._snapshot_pending = False
+
     def _save_data(self, data):
-        os.makedirs(os.path.dirname(self.save_file), exist_ok=True)
-        with open(self.save_file, "w") as f:
-            json.dump(data, f, indent=2)
+        # Snapshot first (atomic), then drop the log it now contains.
+        payload = self.codec.encode(data)
+        atomic_write_bytes(self.save_file, payload)
+        written = len(payload)
+        truncate_log(self.log_file)
+        self.io_stats["snapshots"] += 1
+        self.io_stats["bytes_written"] += written
+        self._update_slot_summary(data)
+
+    def _update_slot_summary(self, data):
+        if self.slot_index is not None:
+            self.slot_index.update(self.slot, data)
 
     def clear_flag(self, key: str):
         """Reset a flag to False."""
         if key in self.data.get("flags", {}):
-            self.data["flags"][key] = False
-            self.save()
+            self._set(("flags", key), False)
+            self.flag_epoch += 1
 
     def reset(self):
         """Reset to a clean new-game state."""
         if os.path.exists(self.save_file):
             os.remove(self.save_file)
+        truncate_log(self.log_file)
+        if self.slot_index is not None:
+            self.slot_index.clear(self.slot)
+        self._clear_dirty()
+        self.flag_epoch += 1
         self.data = self._load_or_init()
-        self._ensure_flags()
+        self._apply_migrations()
+        self._emit_baseline("reset")
 
     # ------------------------------------------------------------
     # Flags (binary game progression markers)
@@ -357,14 +639,16 @@ class GameState:
         Use this for things like:
             self.state.set_flag("rachel_suspicious", True)
         """
-        if not self._is_json_safe(value):
+        # Inside a transaction the value is validated once, at commit.
+        if self._txn is None and not self._is_json_safe(value):
             raise TypeError(
                 f"[GameState] set_flag rejected non-JSON value: "
                 f"{type(value).__name__} = {value}"
             )
-        self.data.setdefault("flags", {})[key] = value
-        self.save()
-        self.auto_sync_tasks()
+        flags = self.data.setdefault("flags", {})
+        if flags.get(key) and not value:
+            self.flag_epoch += 1
+        self._set(("flags", key), value)
         if value and resonance_points is not None:
             self.award_resonance_for_flag(key, resonance_points)
 
@@ -386,24 +670,17 @@ class GameState:
         Automatically keep Act 2 task list synced with key flags.
         This will just silently do nothing if a matching task text
         isn't present in the current task list.
+        set_flag() keeps tasks in sync through flag subscriptions; this
+        full pass is only needed after editing data["flags"] directly.
         """
-        mapping = [
-            ("dr_anand_zoom_complete", "Join Dr. Anand’s Zoom"),
-            ("anand_assignment_complete", "Complete Anand's Assignment"),
-            ("dr_rachel_zoom_complete", "Join Dr. Rachel’s Zoom"),
-            ("rachel_assignment_complete", "Complete Rachel’s Assignment"),
-            ("act2_logoff_complete", "Log Off"),
-            ("lottie_lab_intro_complete", "Prepare for Night Mission"),
-            ("timothy_zoom3_complete", "Join Dr. Timothy's Zoom 3"),
-            ("timothy_assignment_complete", "Complete Timothy's Assignment"),
-            ("beatrice_zoom3_complete", "Join Dr. Beatrice's Zoom 3"),
-            ("act3_logoff_complete", "Log Off Act 3"),
-        ]
-
-        for flag, task_text in mapping:
+        for flag, task_text in _FLAG_TASKS.items():
             if self.get_flag(flag):
                 self.complete_task(task_text)
 
+    def _complete_flag_task(self, flag, old, new):
+        if new:
+            self.complete_task(_FLAG_TASKS[flag])
+
     # ------------------------------------------------------------
     # Resonance (global counter)
     # ------------------------------------------------------------
@@ -411,12 +688,10 @@ class GameState:
         return int(self.data.get("resonance", 0))
 
     def set_resonance(self, value: int):
-        self.data["resonance"] = int(value)
-        self.save()
+        self._set(("resonance",), int(value))
 
     def add_resonance(self, delta: int):
-        self.data["resonance"] = self.get_resonance() + int(delta)
-        self.save()
+        self._set(("resonance",), self.get_resonance() + int(delta))
 
     def award_resonance_for_flag(self, flag_key: str, points: int = 1):
         """
@@ -428,11 +703,31 @@ class GameState:
         seen = self.data.setdefault("resonance_flags_seen", [])
         if flag_key in seen:
             return False
-        self.data["resonance"] = self.get_resonance() + int(points)
-        seen.append(flag_key)
-        self.save()
+        with self.deferred_saves():
+            self._set(("resonance",), self.get_resonance() + int(points))
+            seen.append(flag_key)
+            self._record("add", ("resonance_flags_seen",), flag_key)
         return True
 
+    def award_resonance_on(self, flag_points: dict):
+        """
+        Award resonance when flags turn on, instead of polling
+        sync_resonance_from_flags() every frame:
+            state.award_resonance_on({"lottie_trust_scene_seen": 2})
+        Returns an unsubscribe function for all of them.
+        """
+        def on_flag(flag, old, new):
+            if new:
+                self.award_resonance_for_flag(flag, flag_points[flag])
+
+        unsubscribers = [self.subscribe(flag, on_flag) for flag in flag_points]
+        self.sync_resonance_from_flags(flag_points)  # flags already on
+
+        def unsubscribe():
+            for unsub in unsubscribers:
+                unsub()
+        return unsubscribe
+
     def sync_resonance_from_flags(self, flag_points: dict):
         """
         Backfill resonance based on a mapping of {flag_key: points}.
@@ -444,6 +739,17 @@ class GameState:
                 changed = True
         return changed
 
+    # ------------------------------------------------------------
+    # Progression
+    # ------------------------------------------------------------
+    def set_act(self, act: int):
+        """Move to another act (route exits)."""
+        self._set(("act",), int(act))
+
+    def set_last_scene(self, scene_name):
+        """Remember the scene to resume from (SceneManager on every change)."""
+        self._set(("last_scene",), scene_name)
+
     # ------------------------------------------------------------
     # Player + Trust
     # ------------------------------------------------------------
@@ -463,8 +769,7 @@ class GameState:
         """
         trust = float(self.data.get("trust", 0.5))
         trust = max(0.0, min(1.0, trust + float(delta)))
-        self.data["trust"] = trust
-        self.save()
+        self._set(("trust",), trust)
 
     def get_trust(self):
         return float(self.data.get("trust", 0.5))
@@ -481,9 +786,7 @@ class GameState:
         return settings.get(key, default)
 
     def set_setting(self, key: str, value):
-        settings = self.data.setdefault("settings", {})
-        settings[key] = value
-        self.save()
+        self._set(("settings", key), value)
 
     # --- Act 3 Special Trust System ---
     def get_betrayal_state(self):
@@ -494,18 +797,18 @@ class GameState:
         Mark whether the player betrayed Lottie in Act 3.
         This also adjusts both global trust and act3_trust.
         """
-        self.set_flag("act3_betrayal", betrayed)
+        with self.transaction():
+            self.set_flag("act3_betrayal", betrayed)
 
-        act3_trust = float(self.data.get("act3_trust", 0.5))
-        if betrayed:
-            self.change_trust(-0.5)
-            act3_trust = max(0.0, act3_trust - 0.5)
-        else:
-            self.change_trust(+0.3)
-            act3_trust = min(1.0, act3_trust + 0.3)
+            act3_trust = float(self.data.get("act3_trust", 0.5))
+            if betrayed:
+                self.change_trust(-0.5)
+                act3_trust = max(0.0, act3_trust - 0.5)
+            else:
+                self.change_trust(+0.3)
+                act3_trust = min(1.0, act3_trust + 0.3)
 
-        self.data["act3_trust"] = act3_trust
-        self.save()
+            self._set(("act3_trust",), act3_trust)
 
     def get_act3_trust(self):
         return float(self.data.get("act3_trust", 0.5))
@@ -514,33 +817,25 @@ class GameState:
     # Tasks
     # ------------------------------------------------------------
     def tasks(self):
-        return self.data.get("tasks", [])
+        # Indexed on first use, so a lazily loaded tasks section stays
+        # undecoded until something asks for it.
+        return adopt_tasks(self.data)
 
     def add_task(self, text: str):
         """Add a new task if not already present."""
-        tasks = self.data.setdefault("tasks", [])
-        if not any(t["text"] == text for t in tasks):
-            tasks.append({"text": text, "done": False})
-            self.save()
+        if self.tasks().add(text):
+            self._record("task_add", text=text)
         # NOTE: UI popups should be triggered by desktop scenes, not here.
 
     def complete_task(self, text: str):
         """Mark a task as complete (if present)."""
-        changed = False
-        for t in self.data.get("tasks", []):
-            if t["text"] == text and not t.get("done", False):
-                t["done"] = True
-                changed = True
-        if changed:
-            self.save()
+        if self.tasks().complete(text):
+            self._record("task_done", text=text, old=False)
         # NOTE: UI popups should be triggered externally if desired.
 
     def active_task(self):
         """Return the first incomplete task text, or None."""
-        for t in self.data.get("tasks", []):
-            if not t.get("done", False):
-                return t["text"]
-        return None
+        return self.tasks().active()
 
     def all_tasks_complete(self):
         """
@@ -548,6 +843,8 @@ class GameState:
         This is kept for backward compatibility with Act 1 flow.
         """
         f = self.data.get("flags", {})
+        if isinstance(f, FlagStore):
+            return f.all_set(_ACT1_CORE_MASK)
         return (
             f.get("timothy_zoom_complete")
             and f.get("lottie_assignment1_complete")
@@ -556,6 +853,28 @@ class GameState:
         )
 
 
+def _diff(entries):
+    """Collapse [(record, old)] into {path: (first old, last new)}, dropping no-ops."""
+    diff = {}
+    for record, old in entries:
+        op = record["op"]
+        if op == "set":
+            key, new = tuple(record["path"]), record["value"]
+        elif op == "add":
+            key, old, new = tuple(record["path"]) + (record["value"],), False, True
+        elif op == "task_add":
+            key, old, new = ("tasks", record["text"]), _MISSING, False
+        elif op == "task_done":
+            key, new = ("tasks", record["text"]), True
+        else:
+            continue
+        if old is _MISSING:
+            old = None
+        first = diff.get(key)
+        diff[key] = (first[0] if first else old, new)
+    return {k: v for k, v in diff.items() if v[0] != v[1]}
+
+
 # Optional CLI utilities for debugging saves quickly
 if __name__ == "__main__":
     gs = GameState()
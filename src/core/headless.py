@@ -0,0 +1,198 @@
+# =========================================
+# file: src/core/headless.py
+# =========================================
+"""
+Headless, deterministic simulation mode.
+
+Drives SceneManager + WindowManager + GameState with no visible window:
+SDL's dummy video driver, scripted input events, a fixed dt and no
+display flip. Frames run as fast as the CPU allows instead of at 60 FPS,
+and update/draw time are measured separately so pure logic throughput
+can be compared against rendering.
+
+Used for batch soak runs of the Act 1 route:
+    python -m src.headless --iterations 5000
+    python -m src.headless --iterations 200 --instantiate --frames 30
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import pygame
+
+from src.game_state import GameState
+from src.route_engine import ROUTES
+from src.scene_flow_act1 import next_scene_name, transition
+from src.scene_manager import SceneManager
+from src.window_manager import WindowManager
+
+
+def init_headless(size=(1280, 720)):
+    """Initialise pygame on the dummy drivers and return the screen surface."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    return pygame.display.set_mode(size)
+
+
+def build_headless_game(save_file: str, size=(1280, 720)):
+    """
+    Wire the core systems the same way run.py does, minus the display.
+    Saves stay write-behind and are never flushed on a timer, so a soak
+    run only touches disk when asked to.
+    """
+    screen = init_headless(size)
+    game_state = GameState(
+        save_file, write_behind=True, max_staleness=float("inf")
+    )
+    scene_manager = SceneManager()
+    window_manager = WindowManager(screen, state=game_state)
+    window_manager.game_state = game_state
+    window_manager.scene_manager = scene_manager
+    return screen, game_state, scene_manager, window_manager
+
+
+class HeadlessRunner:
+    """
+    Fixed-dt frame loop over the handle_event/update/draw protocol.
+    script maps frame index → list of pygame events to inject that frame.
+    """
+
+    def __init__(self, scene_manager, screen=None, game_state=None,
+                 dt: float = 1.0 / 60.0, render: bool = True):
+        self.scene_manager = scene_manager
+        self.screen = screen
+        self.game_state = game_state
+        self.dt = dt
+        self.render = render and screen is not None
+
+        self.frame = 0
+        self.update_seconds = 0.0
+        self.draw_seconds = 0.0
+
+    def step(self, events=()):
+        for event in events:
+            self.scene_manager.handle_event(event)
+
+        start = time.perf_counter()
+        self.scene_manager.update(self.dt)
+        streamer = getattr(self.scene_manager, "streamer", None)
+        if streamer is not None:
+            streamer.pump()
+        self.update_seconds += time.perf_counter() - start
+
+        if self.render:
+            start = time.perf_counter()
+            self.scene_manager.draw(self.screen, self.dt, 1.0)
+            self.draw_seconds += time.perf_counter() - start
+
+        self.frame += 1
+
+    def run(self, frames: int, script=None, until=None):
+        """
+        Run up to `frames` frames. Stops early once until() returns True.
+        Returns the number of frames actually run.
+        """
+        script = script or {}
+        for i in range(frames):
+            self.step(script.get(self.frame, ()))
+            if until and until():
+                return i + 1
+        return frames
+
+    def stats(self):
+        return {
+            "frames": self.frame,
+            "update_s": self.update_seconds,
+            "draw_s": self.draw_seconds,
+            "logic_fps": self.frame / self.update_seconds if self.update_seconds else 0.0,
+        }
+
+
+def soak_act1(iterations: int, instantiate: bool = False,
+              frames_per_scene: int = 0, render: bool = False,
+              max_hops: int = 64, save_dir=None):
+    """
+    Play the full Act 1 route `iterations` times from a fresh save.
+
+    Each hop asks the router for the next scene and then completes that
+    route step by setting its guard flags. With instantiate=True the
+    scene is really built through scene_flow_act1.transition() and run
+    for frames_per_scene headless frames first.
+    """
+    own_dir = save_dir is None
+    save_dir = save_dir or tempfile.mkdtemp(prefix="soak_")
+    screen, game_state, scene_manager, window_manager = build_headless_game(
+        os.path.join(save_dir, "state.json")
+    )
+    runner = HeadlessRunner(
+        scene_manager, screen, game_state, render=render
+    )
+
+    completed = 0
+    failures = []
+    hops_total = 0
+    start = time.perf_counter()
+    try:
+        for i in range(iterations):
+            game_state.reset()
+            window_manager.close_all()
+            path = []
+            while game_state.data.get("act", 1) == 1 and len(path) < max_hops:
+                route = ROUTES.current_route(game_state)
+                if instantiate:
+                    path.append(ROUTES.peek(game_state))
+                    transition(scene_manager, window_manager)
+                    runner.run(frames_per_scene)
+                    window_manager.close_all()
+                else:
+                    path.append(next_scene_name(game_state))
+                if route is not None:
+                    for flag in route.guards:
+                        game_state.set_flag(flag, True)
+            hops_total += len(path)
+            if game_state.data.get("act", 1) == 2:
+                completed += 1
+            else:
+                failures.append({"iteration": i, "path": path})
+    finally:
+        game_state.flush()
+        if own_dir:
+            shutil.rmtree(save_dir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - start
+    result = {
+        "iterations": iterations,
+        "completed": completed,
+        "failures": failures[:10],
+        "hops": hops_total,
+        "elapsed_s": elapsed,
+        "runs_per_minute": iterations / elapsed * 60.0 if elapsed else 0.0,
+    }
+    result.update(runner.stats())
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Headless Act 1 soak test")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--instantiate", action="store_true",
+                        help="build each routed scene and run it headless")
+    parser.add_argument("--frames", type=int, default=0,
+                        help="frames to run per scene with --instantiate")
+    parser.add_argument("--render", action="store_true",
+                        help="also call draw() (measures render cost)")
+    args = parser.parse_args()
+
+    report = soak_act1(
+        args.iterations,
+        instantiate=args.instantiate,
+        frames_per_scene=args.frames,
+        render=args.render,
+    )
+    print(json.dumps(report, indent=2))
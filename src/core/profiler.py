@@ -0,0 +1,228 @@
+# =========================================
+# file: src/core/profiler.py
+# =========================================
+"""
+Frame-time profiler and hot-path instrumentation.
+
+run.py marks the phases of each frame (event / update / draw / flip /
+save); WindowManager reports per-window draw times; GameState.io_stats
+is sampled for saves and bytes written per frame. The last N frames are kept in a ring buffer,
+can be exported as Chrome trace JSON (chrome://tracing, Perfetto) and
+are summarised by an in-game overlay (F3 toggles, F4 exports).
+
+When disabled, every hook is a single attribute check, so it can stay
+in production builds.
+"""
+
+import json
+import time
+from collections import deque
+
+import pygame
+
+
+class FrameProfiler:
+    def __init__(self, capacity: int = 600):
+        self.enabled = False
+        self.frames = deque(maxlen=capacity)
+        self._frame = None
+        self._last = 0.0
+        self._index = 0
+        self._tracked = []   # [(prefix, stats dict, values at frame start)]
+
+    def track_counters(self, stats: dict, prefix: str = ""):
+        """Report per-frame deltas of a live counter dict (e.g. GameState.io_stats)."""
+        self._tracked.append((prefix, stats, dict(stats)))
+
+    # ------------------------------------------------------------
+    # Frame phases (run.py)
+    # ------------------------------------------------------------
+    def begin_frame(self, scene=None):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._frame = {
+            "index": self._index,
+            "start": now,
+            "scene": type(scene).__name__ if scene is not None else None,
+            "phases": [],     # (name, start, seconds)
+            "windows": [],    # (name, start, seconds)
+            "counters": {},
+        }
+        self._last = now
+        self._index += 1
+        for _prefix, stats, before in self._tracked:
+            before.update(stats)
+
+    def mark(self, phase: str):
+        """Close the current phase: time since the previous mark."""
+        frame = self._frame
+        if frame is None:
+            return
+        now = time.perf_counter()
+        frame["phases"].append((phase, self._last, now - self._last))
+        self._last = now
+
+    def end_frame(self):
+        frame = self._frame
+        if frame is None:
+            return
+        frame["total"] = time.perf_counter() - frame["start"]
+        counters = frame["counters"]
+        for prefix, stats, before in self._tracked:
+            for key, value in stats.items():
+                delta = value - before.get(key, 0)
+                if delta:
+                    counters[prefix + key] = counters.get(prefix + key, 0) + delta
+        self.frames.append(frame)
+        self._frame = None
+
+    # ------------------------------------------------------------
+    # Hot-path hooks (WindowManager, scenes)
+    # ------------------------------------------------------------
+    def record_window(self, name: str, start: float, seconds: float):
+        if self._frame is not None:
+            self._frame["windows"].append((name, start, seconds))
+
+    def count(self, name: str, amount=1):
+        if self._frame is not None:
+            counters = self._frame["counters"]
+            counters[name] = counters.get(name, 0) + amount
+
+    # ------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------
+    def summary(self, last: int = 60):
+        """Average ms per phase / scene / window over the last frames."""
+        frames = list(self.frames)[-last:]
+        if not frames:
+            return {"frames": 0}
+
+        def avg(totals):
+            return {k: v * 1000.0 / len(frames) for k, v in totals.items()}
+
+        phases, scenes, windows, counters = {}, {}, {}, {}
+        for frame in frames:
+            for name, _start, secs in frame["phases"]:
+                phases[name] = phases.get(name, 0.0) + secs
+            scene = frame["scene"] or "?"
+            scenes[scene] = scenes.get(scene, 0.0) + frame["total"]
+            for name, _start, secs in frame["windows"]:
+                windows[name] = windows.get(name, 0.0) + secs
+            for name, value in frame["counters"].items():
+                counters[name] = counters.get(name, 0) + value
+
+        totals = [f["total"] for f in frames]
+        return {
+            "frames": len(frames),
+            "avg_ms": sum(totals) * 1000.0 / len(frames),
+            "max_ms": max(totals) * 1000.0,
+            "phases_ms": avg(phases),
+            "scenes_ms": avg(scenes),
+            "windows_ms": avg(windows),
+            "counters_per_frame": {k: v / len(frames) for k, v in counters.items()},
+        }
+
+    def chrome_trace(self):
+        """The ring buffer as Chrome trace events (microsecond timestamps)."""
+        events = []
+        origin = self.frames[0]["start"] if self.frames else 0.0
+
+        def us(t):
+            return (t - origin) * 1_000_000.0
+
+        for frame in self.frames:
+            events.append({
+                "name": f"frame {frame['index']}", "cat": "frame", "ph": "X",
+                "ts": us(frame["start"]), "dur": frame["total"] * 1_000_000.0,
+                "pid": 1, "tid": 1, "args": {"scene": frame["scene"]},
+            })
+            for name, start, secs in frame["phases"]:
+                events.append({
+                    "name": name, "cat": "phase", "ph": "X",
+                    "ts": us(start), "dur": secs * 1_000_000.0, "pid": 1, "tid": 1,
+                })
+            for name, start, secs in frame["windows"]:
+                events.append({
+                    "name": name, "cat": "window", "ph": "X",
+                    "ts": us(start), "dur": secs * 1_000_000.0, "pid": 1, "tid": 1,
+                })
+            if frame["counters"]:
+                events.append({
+                    "name": "counters", "ph": "C", "ts": us(frame["start"]),
+                    "pid": 1, "tid": 1, "args": frame["counters"],
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        print(f"[Profiler] Wrote {len(self.frames)} frames to {path}")
+
+
+class ProfilerOverlay:
+    """Small text panel with the profiler summary. F3 toggles, F4 exports."""
+
+    toggle_key = pygame.K_F3
+    export_key = pygame.K_F4
+
+    def __init__(self, profiler: FrameProfiler, trace_path: str = "profile_trace.json"):
+        self.profiler = profiler
+        self.trace_path = trace_path
+        self.visible = False
+        self._font = None
+        self._lines = []
+        self._refresh_at = 0.0
+
+    def handle_event(self, event) -> bool:
+        """Returns True if the event was a profiler hotkey."""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == self.toggle_key:
+            self.visible = not self.visible
+            self.profiler.enabled = self.visible
+            return True
+        if event.key == self.export_key and self.profiler.frames:
+            self.profiler.export_chrome_trace(self.trace_path)
+            return True
+        return False
+
+    def draw(self, screen: pygame.Surface):
+        if not self.visible:
+            return
+        if self._font is None:
+            self._font = pygame.font.SysFont("Consolas", 14)
+
+        # Re-render text a few times per second, not every frame.
+        now = time.perf_counter()
+        if now >= self._refresh_at:
+            self._refresh_at = now + 0.25
+            self._lines = [
+                self._font.render(line, True, (230, 230, 230))
+                for line in self._summary_lines()
+            ]
+
+        width = max((s.get_width() for s in self._lines), default=0) + 12
+        height = len(self._lines) * 16 + 8
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        for i, surf in enumerate(self._lines):
+            panel.blit(surf, (6, 4 + i * 16))
+        screen.blit(panel, (8, 8))
+
+    def _summary_lines(self):
+        s = self.profiler.summary()
+        if not s.get("frames"):
+            return ["profiler: collecting..."]
+        lines = [f"frame {s['avg_ms']:.2f} ms avg / {s['max_ms']:.2f} max"]
+        for name, ms in s["phases_ms"].items():
+            lines.append(f"  {name:<8} {ms:6.2f} ms")
+        for name, ms in sorted(s["windows_ms"].items(), key=lambda kv: -kv[1])[:5]:
+            lines.append(f"  [{name}] {ms:6.2f} ms")
+        for name, value in s["counters_per_frame"].items():
+            lines.append(f"  {name}: {value:.2f}/frame")
+        return lines
+
+
+# Shared profiler; hooks across the core modules report here.
+PROFILER = FrameProfiler()
@@ -0,0 +1,395 @@
+# =========================================
+# file: src/core/route_engine.py
+# =========================================
+"""
+Table-driven routing engine shared by every Act.
+
+An Act's flow is declared as an ordered RouteTable of steps:
+    Route(guard flags → scene key, optional effects)
+The first step whose guard flags are not all set decides the next
+scene. When every guard is satisfied the table's exit scene is used.
+
+Tables are compiled once into an indexed structure (flag → step
+indices) and the engine remembers, per GameState, the position of the
+first unsatisfied guard. Since progression flags only ever flip on,
+re-evaluation after a flag change resumes from that position instead
+of re-scanning the whole chain. The cursor is tied to the FlagStore it
+was computed on and to its version, which is bumped whenever a flag
+turns off or is removed, including direct data["flags"][...] writes. A
+reload (new store) or a cleared flag therefore resets it. Plain-dict
+flags are scanned from the start every time.
+
+Effects are declarative so tables stay inspectable:
+    ("set_flag", key, value)   → game_state.set_flag(key, value)
+    ("set_act", n)             → game_state.set_act(n)
+
+A table can also consult a precomputed decision table (one step index
+per combination of its guard flags, built by `python -m src.route_graph`
+and loaded with ROUTES.load_lookup()). Routing is then a single dict
+lookup on the store's guard bits, with no chain walk or cursor.
+"""
+
+import hashlib
+import json
+import os
+import weakref
+
+from src.flag_store import FLAG_REGISTRY, FlagStore
+
+# Acts with more distinct guard flags than this keep routing by scanning
+# (a decision table has 2**flags entries).
+MAX_LOOKUP_FLAGS = 18
+
+
+class Route:
+    """One step of an Act's flow."""
+
+    __slots__ = ("guards", "scene", "effects", "mask")
+
+    def __init__(self, guards, scene: str, effects=()):
+        self.guards = (guards,) if isinstance(guards, str) else tuple(guards)
+        self.scene = scene
+        self.effects = tuple(effects)
+        self.mask = FLAG_REGISTRY.mask(self.guards)
+
+    def satisfied(self, flags, assumed=()):
+        return all(flags.get(g) or g in assumed for g in self.guards)
+
+    def __repr__(self):
+        return f"Route({self.guards!r} → {self.scene!r})"
+
+
+class RouteTable:
+    """An Act's ordered route, compiled once on construction."""
+
+    def __init__(self, act: int, routes, exit_scene=None, exit_effects=()):
+        self.act = act
+        self.routes = tuple(routes)
+        self.exit_scene = exit_scene
+        self.exit_effects = tuple(exit_effects)
+
+        # flag → indices of steps guarded by it
+        self.flag_index = {}
+        for i, route in enumerate(self.routes):
+            for flag in route.guards:
+                self.flag_index.setdefault(flag, []).append(i)
+
+        # Distinct guard flags in first-use order (bit i of a decision key).
+        self.guard_flags = tuple(self.flag_index)
+        self.guard_mask = FLAG_REGISTRY.mask(self.guard_flags)
+        self._lookup = None   # guard truth bits → step index
+
+    def first_open(self, flags, start: int = 0, assumed=()):
+        """Index of the first unsatisfied step at or after start (len = exit)."""
+        routes = self.routes
+        i = start
+        if not assumed and isinstance(flags, FlagStore):
+            lookup = self._lookup
+            if lookup is not None:
+                index = lookup[flags.truth_bits(self.guard_mask)]
+                if index >= start:
+                    return index
+            # Bitset fast path: one mask test per step.
+            while i < len(routes) and flags.all_set(routes[i].mask):
+                i += 1
+            return i
+        while i < len(routes) and routes[i].satisfied(flags, assumed):
+            i += 1
+        return i
+
+    def scene_at(self, index: int):
+        if index < len(self.routes):
+            return self.routes[index].scene
+        return self.exit_scene
+
+    def effects_at(self, index: int):
+        if index < len(self.routes):
+            return self.routes[index].effects
+        return self.exit_effects
+
+    # ------------------------------------------------------------
+    # Precomputed decisions
+    # ------------------------------------------------------------
+    def fingerprint(self) -> str:
+        """Short hash of the table's definition (detects stale lookups)."""
+        spec = (
+            self.act,
+            [(r.guards, r.scene, r.effects) for r in self.routes],
+            self.exit_scene,
+            self.exit_effects,
+        )
+        return hashlib.sha1(repr(spec).encode("utf-8")).hexdigest()[:16]
+
+    def decisions(self) -> bytearray:
+        """
+        The step index chosen for every combination of guard flags,
+        indexed by dense key (bit i set = guard_flags[i] is on).
+
+        Built symbolically rather than by evaluating each combination:
+        step i decides exactly when every earlier guard is on and one of
+        its own is off, so for each step only the keys over its prefix
+        are visited, and every key is written once.
+        """
+        count = len(self.guard_flags)
+        if count > MAX_LOOKUP_FLAGS or len(self.routes) > 255:
+            raise ValueError(
+                f"act {self.act}: {count} guard flags is too many for a lookup table"
+            )
+        bit = {flag: 1 << i for i, flag in enumerate(self.guard_flags)}
+        full = (1 << count) - 1
+        table = bytearray([len(self.routes)]) * (1 << count)
+        prefix = 0
+        for i, route in enumerate(self.routes):
+            own = 0
+            for flag in route.guards:
+                own |= bit[flag]
+            free = full & ~prefix
+            subset = free
+            while True:
+                key = prefix | subset
+                if key & own != own:
+                    table[key] = i
+                if not subset:
+                    break
+                subset = (subset - 1) & free
+            prefix |= own
+            if prefix == full:
+                break   # every later step (and the exit) only sees full keys
+        return table
+
+    def install_lookup(self, decisions):
+        """Route through a decision table from decisions() (None to drop it)."""
+        if decisions is None:
+            self._lookup = None
+            return
+        if len(decisions) != 1 << len(self.guard_flags):
+            raise ValueError(f"act {self.act}: decision table has the wrong size")
+        # Dense key → FlagStore slot bits, one OR per key.
+        slot_bits = [1 << FLAG_REGISTRY.slot(f) for f in self.guard_flags]
+        bits = [0] * len(decisions)
+        lookup = {0: decisions[0]}
+        for key in range(1, len(decisions)):
+            low = key & -key
+            bits[key] = bits[key ^ low] | slot_bits[low.bit_length() - 1]
+            lookup[bits[key]] = decisions[key]
+        self._lookup = lookup
+
+    @property
+    def has_lookup(self) -> bool:
+        return self._lookup is not None
+
+    # ------------------------------------------------------------
+    # Validation
+    # ------------------------------------------------------------
+    def unreachable_steps(self):
+        """
+        Steps that can never be selected: to reach step i every earlier
+        guard must be set, so if step i's guards are a subset of those it
+        is already satisfied by the time the router gets there.
+        """
+        seen = set()
+        dead = []
+        for i, route in enumerate(self.routes):
+            if set(route.guards) <= seen:
+                dead.append(i)
+            seen.update(route.guards)
+        return dead
+
+    def is_reachable(self, scene: str, flags=None):
+        """
+        True if some step (or the exit) can route to scene. With flags,
+        only steps at or after the current position are considered.
+        """
+        start = self.first_open(flags) if flags is not None else 0
+        dead = set(self.unreachable_steps())
+        for i in range(start, len(self.routes)):
+            if i not in dead and self.routes[i].scene == scene:
+                return True
+        return scene == self.exit_scene
+
+    def scenes(self):
+        names = [r.scene for r in self.routes]
+        if self.exit_scene:
+            names.append(self.exit_scene)
+        return list(dict.fromkeys(names))
+
+    def validate(self, registered=None):
+        """
+        Return a list of human-readable problems with this table.
+        registered: optional collection of valid scene keys.
+        """
+        problems = []
+        for i in self.unreachable_steps():
+            route = self.routes[i]
+            problems.append(
+                f"act {self.act}: step {i} {route.scene!r} is unreachable "
+                f"(guards {route.guards} already set by earlier steps)"
+            )
+        if registered is not None:
+            for name in self.scenes():
+                if name not in registered:
+                    problems.append(f"act {self.act}: scene {name!r} is not registered")
+        return problems
+
+
+class RouteEngine:
+    """Holds one RouteTable per act and evaluates them against a GameState."""
+
+    def __init__(self):
+        self.tables = {}
+        # game_state → (act, flag store, store version, cursor)
+        self._cursors = weakref.WeakKeyDictionary()
+        # act → lookup entry loaded before its table was registered
+        self._pending_lookups = {}
+
+    def register(self, table: RouteTable):
+        self.tables[table.act] = table
+        self._cursors.clear()
+        entry = self._pending_lookups.pop(table.act, None)
+        if entry is not None:
+            self._install(table, entry)
+
+    def table_for(self, game_state):
+        return self.tables.get(game_state.data.get("act", 1))
+
+    # ------------------------------------------------------------
+    # Precomputed lookups
+    # ------------------------------------------------------------
+    def compile_lookups(self):
+        """Build and install decision tables in-process for every table."""
+        for table in self.tables.values():
+            try:
+                table.install_lookup(table.decisions())
+            except ValueError as e:
+                print(f"⚠ {e}; routing act {table.act} by scanning")
+
+    def load_lookup(self, path: str) -> int:
+        """
+        Install the decision tables from a route_graph artifact. Tables
+        not registered yet are installed when they are. Missing files are
+        fine (routing just scans); stale entries are skipped with a
+        warning. Returns the number of entries accepted.
+        """
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                tables = json.load(f).get("tables", {})
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not read route lookup {path}: {e}")
+            return 0
+
+        accepted = 0
+        for act, entry in tables.items():
+            act = int(act)
+            table = self.tables.get(act)
+            if table is None:
+                self._pending_lookups[act] = entry
+                accepted += 1
+            elif self._install(table, entry):
+                accepted += 1
+        return accepted
+
+    def _install(self, table, entry) -> bool:
+        if entry.get("fingerprint") != table.fingerprint() or \
+                tuple(entry.get("flags", ())) != table.guard_flags:
+            print(
+                f"⚠ Route lookup for act {table.act} is stale; "
+                f"rebuild it with: python -m src.route_graph"
+            )
+            return False
+        table.install_lookup(bytes.fromhex(entry["decisions"]))
+        self._cursors.clear()
+        return True
+
+    def _position(self, game_state, table):
+        flags = game_state.data.get("flags", {})
+        if not isinstance(flags, FlagStore):
+            return table.first_open(flags)
+        if table.has_lookup:
+            return table.first_open(flags)   # one dict lookup, no cursor needed
+
+        start = 0
+        try:
+            cached = self._cursors.get(game_state)
+        except TypeError:   # not weak-referenceable: no cursor
+            return table.first_open(flags)
+        if cached and cached[0] == table.act and cached[1] is flags \
+                and cached[2] == flags.version:
+            start = cached[3]
+
+        index = table.first_open(flags, start)
+        self._cursors[game_state] = (table.act, flags, flags.version, index)
+        return index
+
+    def current_route(self, game_state):
+        """The Route that currently decides the next scene (None at the exit)."""
+        table = self.table_for(game_state)
+        if table is None:
+            return None
+        index = self._position(game_state, table)
+        return table.routes[index] if index < len(table.routes) else None
+
+    def peek(self, game_state):
+        """Next scene key without applying any effects (None if no table)."""
+        table = self.table_for(game_state)
+        if table is None:
+            return None
+        return table.scene_at(self._position(game_state, table))
+
+    def next_scene_name(self, game_state):
+        """Next scene key for the current act, applying the step's effects."""
+        table = self.table_for(game_state)
+        if table is None:
+            return None
+        index = self._position(game_state, table)
+        apply_effects(game_state, table.effects_at(index))
+        return table.scene_at(index)
+
+    def predict(self, game_state, hops: int = 2):
+        """
+        Side-effect-free lookahead: the next `hops` distinct scenes,
+        assuming each predicted step completes (its guards get set).
+        """
+        table = self.table_for(game_state)
+        if table is None:
+            return []
+        flags = game_state.data.get("flags", {})
+        assumed = set()
+        names = []
+        index = self._position(game_state, table)
+        while len(names) < hops:
+            index = table.first_open(flags, index, assumed)
+            name = table.scene_at(index)
+            if name and name not in names:
+                names.append(name)
+            if index >= len(table.routes):
+                break
+            assumed.update(table.routes[index].guards)
+        return names
+
+    def validate(self, registered=None):
+        problems = []
+        for act in sorted(self.tables):
+            problems.extend(self.tables[act].validate(registered))
+        return problems
+
+
+def apply_effects(game_state, effects):
+    for effect in effects:
+        kind = effect[0]
+        if kind == "set_flag":
+            game_state.set_flag(effect[1], effect[2])
+        elif kind == "set_act":
+            set_act = getattr(game_state, "set_act", None)
+            if callable(set_act):
+                set_act(effect[1])
+            else:
+                game_state.data["act"] = effect[1]
+                game_state.save()
+        else:
+            print(f"⚠ Unknown route effect: {effect!r}")
+
+
+# Shared engine; each act's flow module registers its table here.
+ROUTES = RouteEngine()
@@ -0,0 +1,224 @@
+# =========================================
+# file: src/core/route_graph.py
+# =========================================
+"""
+Build-time reachability analysis for the route tables.
+
+Explores each act's flag space symbolically and builds the full
+transition graph. It doesn't enumerate flag combinations to do this.
+The router's position is the only state that matters: step i decides
+exactly when every earlier guard is on and one of its own is off. So
+each step is one abstract state, and its successors are the later steps
+that some combination of flags can still select.
+
+Reports:
+    - steps that can never be selected (guards implied by earlier steps)
+    - steps that can't be reached from a new game
+    - scene keys a table routes to that aren't in scene_registry.SCENES
+    - registered scenes no table routes to (opened directly by scenes
+      and apps, or dead)
+
+Writes an artifact that runtime routing loads with ROUTES.load_lookup().
+It holds the graph, plus a decision table per act (the step index for
+every combination of guard flags):
+
+    python -m src.route_graph --out build/routes.json
+    python -m src.route_graph --strict      # exit 1 on problems (CI)
+"""
+
+import difflib
+import importlib
+import json
+import os
+import time
+
+from src.route_engine import ROUTES
+from src.scene_registry import SCENES
+
+# Modules whose import registers an act's RouteTable with ROUTES.
+FLOW_MODULES = ("src.scene_flow_act1",)
+
+
+def load_tables(engine=ROUTES):
+    for module in FLOW_MODULES:
+        importlib.import_module(module)
+    return engine.tables
+
+
+# ------------------------------------------------------------
+# Symbolic exploration
+# ------------------------------------------------------------
+def _effect_flags(effects):
+    return {e[1] for e in effects if e[0] == "set_flag" and e[2]}
+
+
+def explore(table):
+    """
+    Abstract states of a table: one per step (plus the exit, index
+    len(routes)). Returns a list of dicts per state:
+
+        scene      scene key routed to
+        next       the successor when only this step's guards (and its
+                   set_flag effects) get set, i.e. the intended path
+        may        every successor some flag combination can produce
+                   once this step completes (out-of-order flags, saves
+                   edited by hand, debug menus...)
+        reachable  whether a new game can ever get here
+    """
+    routes = table.routes
+    exit_index = len(routes)
+    states = []
+    prefix = set()           # guards of every earlier step
+    for i, route in enumerate(routes):
+        done = prefix | set(route.guards) | _effect_flags(route.effects)
+        intended = table.first_open({}, 0, assumed=done)
+        may = []
+        implied = set(done)
+        for j in range(i + 1, exit_index):
+            # j is selectable iff one of its guards can still be off
+            # while every step between i and j is satisfied.
+            if not set(routes[j].guards) <= implied:
+                may.append(j)
+            implied.update(routes[j].guards)
+        may.append(exit_index)
+        states.append({
+            "index": i,
+            "scene": route.scene,
+            "guards": list(route.guards),
+            "next": intended,
+            "may": may,
+            "reachable": False,
+        })
+        prefix.update(route.guards)
+    states.append({
+        "index": exit_index,
+        "scene": table.exit_scene,
+        "guards": [],
+        "next": None,
+        "may": [],
+        "reachable": False,
+        "effects": [list(e) for e in table.exit_effects],
+    })
+
+    # New game: no guard flags on.
+    frontier = [table.first_open({})]
+    while frontier:
+        i = frontier.pop()
+        if states[i]["reachable"]:
+            continue
+        states[i]["reachable"] = True
+        frontier.extend(states[i]["may"])
+    return states
+
+
+def scene_edges(states):
+    """Collapse step states into scene → scene edges: {(a, b): "next"|"may"}."""
+    edges = {}
+    for state in states:
+        if not state["reachable"]:
+            continue
+        for j in state["may"]:
+            target = states[j]
+            kind = "next" if j == state["next"] else "may"
+            key = (state["scene"], target["scene"])
+            if edges.get(key) != "next":
+                edges[key] = kind
+    return edges
+
+
+# ------------------------------------------------------------
+# Report
+# ------------------------------------------------------------
+def _suggest(name, registered):
+    match = difflib.get_close_matches(name, list(registered), n=1, cutoff=0.6)
+    return f" (did you mean {match[0]!r}?)" if match else ""
+
+
+def analyze(engine=ROUTES, registered=SCENES):
+    """Graph, decision tables and problems for every registered act."""
+    report = {"tables": {}, "problems": [], "unrouted": []}
+    routed = set()
+    for act in sorted(engine.tables):
+        table = engine.tables[act]
+        states = explore(table)
+        entry = {
+            "fingerprint": table.fingerprint(),
+            "flags": list(table.guard_flags),
+            "states": states,
+            "edges": [
+                {"from": a, "to": b, "kind": kind}
+                for (a, b), kind in scene_edges(states).items()
+            ],
+        }
+        try:
+            entry["decisions"] = bytes(table.decisions()).hex()
+        except ValueError as e:
+            report["problems"].append(str(e))
+        report["tables"][str(act)] = entry
+
+        for i in table.unreachable_steps():
+            route = table.routes[i]
+            report["problems"].append(
+                f"act {act}: step {i} {route.scene!r} is unreachable "
+                f"(guards {route.guards} already set by earlier steps)"
+            )
+        dead = set(table.unreachable_steps())
+        for state in states:
+            if not state["reachable"] and state["index"] not in dead and state["scene"]:
+                report["problems"].append(
+                    f"act {act}: step {state['index']} {state['scene']!r} "
+                    f"can't be reached from a new game"
+                )
+        for name in table.scenes():
+            routed.add(name)
+            if name not in registered:
+                report["problems"].append(
+                    f"act {act}: routes to {name!r}, which is not registered"
+                    + _suggest(name, registered)
+                )
+    report["unrouted"] = sorted(set(registered) - routed)
+    return report
+
+
+def write_artifact(report, path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Route reachability analysis")
+    parser.add_argument("--out", default="build/routes.json", help="artifact path")
+    parser.add_argument("--strict", action="store_true", help="exit 1 if there are problems")
+    parser.add_argument("--verbose", action="store_true", help="print every edge")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    load_tables()
+    result = analyze()
+    write_artifact(result, args.out)
+    elapsed = (time.perf_counter() - start) * 1000.0
+
+    for act, entry in result["tables"].items():
+        states = entry["states"]
+        reachable = sum(1 for s in states if s["reachable"])
+        print(
+            f"[Routes] act {act}: {len(states)} states ({reachable} reachable), "
+            f"{len(entry['edges'])} scene edges, {len(entry['flags'])} guard flags"
+        )
+        if args.verbose:
+            for edge in entry["edges"]:
+                arrow = "→" if edge["kind"] == "next" else "⇢"
+                print(f"    {edge['from']} {arrow} {edge['to']}")
+    if result["unrouted"]:
+        print(f"[Routes] not routed by any table: {', '.join(result['unrouted'])}")
+    for problem in result["problems"]:
+        print(f"⚠ {problem}")
+    print(f"[Routes] Wrote {args.out} in {elapsed:.1f} ms")
+    if args.strict and result["problems"]:
+        sys.exit(1)
@@ -3,38 +3,113 @@ import pygame
 from src.scene_manager import SceneManager
 from src.window_manager import WindowManager
 from src.game_state import GameState
+from src.scene_prefetch import ScenePrefetcher
+from src.timestep import FixedTimestep
+from src.profiler import PROFILER, ProfilerOverlay
+from src.asset_manager import ASSETS
+from src.asset_stream import ASSET_STREAMER
+from src.route_engine import ROUTES
 from src.scenes.main_menu import MainMenuScene
 from src.scenes.warning_screen import WarningScreenScene
 
+# Simulation runs at a fixed rate; rendering is capped separately.
+SIM_HZ = 60
+RENDER_FPS = 60     # 0 = uncapped
+VSYNC = False       # let the display's refresh rate pace rendering
+MAX_FRAME_TIME = 0.25
+MAX_CATCHUP_STEPS = 5
+PROFILE = False     # start with the frame profiler on (F3 toggles it)
+SAVE_FORMAT = "json"  # or "binary": sectioned, lazily decoded (save_codec.py)
+ROUTE_LOOKUP = "build/routes.json"  # from python -m src.route_graph (optional)
+
+
 def main():
     pygame.init()
     info = pygame.display.Info()
-    screen = pygame.display.set_mode((info.current_w, info.current_h), pygame.FULLSCREEN | pygame.SCALED)
+    screen = pygame.display.set_mode(
+        (info.current_w, info.current_h),
+        pygame.FULLSCREEN | pygame.SCALED,
+        vsync=1 if VSYNC else 0,
+    )
     clock = pygame.time.Clock()
+    timestep = FixedTimestep(
+        step=1.0 / SIM_HZ,
+        max_frame_time=MAX_FRAME_TIME,
+        max_steps=MAX_CATCHUP_STEPS,
+    )
 
-    game_state = GameState()
-    scene_manager = SceneManager()
-    window_manager = WindowManager(screen, state=game_state)
+    # Write-behind saves: mutations mark the state dirty and the loop
+    # flushes at most once per frame.
+    game_state = GameState(write_behind=True, save_codec=SAVE_FORMAT)
+    # Route by the precomputed decision tables when the build produced them.
+    ROUTES.load_lookup(ROUTE_LOOKUP)
+    # Pushed menus/popups composite over a cached frame of the scene below.
+    scene_manager = SceneManager(layered=True)
+    # Retained UI: only damaged regions are recomposed and pushed to the
+    # display; falls back to a full flip whenever anything can't report damage.
+    window_manager = WindowManager(
+        screen, state=game_state, retained=True, assets=ASSETS
+    )
     window_manager.game_state = game_state
     window_manager.scene_manager = scene_manager
+    scene_manager.prefetcher = ScenePrefetcher(hops=2)
+
+    PROFILER.enabled = PROFILE
+    PROFILER.track_counters(game_state.io_stats, prefix="save_")
+    PROFILER.track_counters(ASSET_STREAMER.stats, prefix="stream_")
+    profiler_overlay = ProfilerOverlay(PROFILER)
+    profiler_overlay.visible = PROFILE
 
     # Start at Warning Screen before Main Menu
     start_scene = WarningScreenScene(scene_manager, window_manager)
     scene_manager.set(start_scene)
+    scene_manager.prefetcher.schedule(game_state)
 
     running = True
     while running:
-        dt = clock.tick(60) / 1000.0
+        frame_time = clock.tick(RENDER_FPS) / 1000.0
+        PROFILER.begin_frame(scene_manager.current())
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-            else:
+            elif not profiler_overlay.handle_event(event):
                 scene_manager.handle_event(event)
+        PROFILER.mark("event")
+
+        for _ in range(timestep.advance(frame_time)):
+            scene_manager.update(timestep.step)
+        PROFILER.mark("update")
+
+        # Finish streamed assets within a small per-frame budget.
+        ASSET_STREAMER.pump()
+        # Import predicted next scenes on this thread, one per frame.
+        scene_manager.prefetcher.pump()
+        PROFILER.mark("assets")
+
+        # Same clamp as the simulation, so dt-driven animation doesn't
+        # jump by a whole stall.
+        draw_dt = min(frame_time, timestep.max_frame_time)
+        scene_manager.draw(screen, draw_dt, timestep.alpha)
+        rects = window_manager.take_frame_rects()
+        if profiler_overlay.visible:
+            profiler_overlay.draw(screen)
+            rects = None
+        PROFILER.mark("draw")
+
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+        PROFILER.mark("flip")
 
-        scene_manager.update(dt)
-        scene_manager.draw(screen, dt)
-        pygame.display.flip()
+        game_state.end_frame()
+        PROFILER.mark("save")
+        PROFILER.end_frame()
 
+    game_state.flush()
+    scene_manager.prefetcher.shutdown()
+    ASSET_STREAMER.shutdown()
+    print(f"[Assets] {ASSETS.report()}")
     pygame.quit()
 
 
@@ -0,0 +1,350 @@
+# =========================================
+# file: src/core/save_codec.py
+# =========================================
+"""
+Pluggable save snapshot serializers.
+
+    json     the original format: indented JSON (human-readable, default)
+    binary   a sectioned container: top-level scalars are decoded up front,
+             every dict/list section (flags, tasks, settings, resonance
+             history, per-act data, ...) is kept as raw bytes and decoded
+             on first access. Sections nobody touched are written back
+             byte-for-byte, so a save only re-encodes what changed.
+
+Section payloads use msgpack when it is installed, otherwise compact
+JSON; each section records which, so files stay readable either way.
+Loading detects the format from the file header, so old JSON saves load
+unchanged and are rewritten in the configured format on the next save.
+
+Binary layout (little-endian):
+    8s magic "GSAVBIN1", H section count
+    per section: B name length, name (UTF-8), B codec, I payload length
+    payloads, in the same order
+Section "" holds the scalars.
+
+Benchmark against the current format:
+    python -m src.save_codec save/state.json --repeat 200
+"""
+
+import json
+import struct
+import time
+
+from src.save_journal import _json_default
+
+try:
+    import msgpack
+except ImportError:  # optional; sections fall back to compact JSON
+    msgpack = None
+
+_MAGIC = b"GSAVBIN1"
+_COUNT = struct.Struct("<H")
+_SECTION = struct.Struct("<BI")
+
+SECTION_JSON = 0
+SECTION_MSGPACK = 1
+
+
+def _encode_section(value, codec: int) -> bytes:
+    if codec == SECTION_MSGPACK:
+        return msgpack.packb(value, default=_json_default, use_bin_type=True)
+    return json.dumps(value, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def _decode_section(codec: int, payload: bytes):
+    if codec == SECTION_MSGPACK:
+        if msgpack is None:
+            raise ValueError("save section is msgpack-encoded but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload.decode("utf-8"))
+
+
+class LazySaveData(dict):
+    """
+    State dict whose sections decode on first access. Behaves like the
+    plain dict GameState always used; anything that walks every value
+    (items(), values(), ==, copy()) decodes the remaining sections first.
+    """
+
+    def __init__(self, eager=(), raw=None):
+        super().__init__(eager)
+        self._raw = raw or {}    # name → (codec, payload bytes)
+
+    def _load(self, key):
+        codec, payload = self._raw.pop(key)
+        value = _decode_section(codec, payload)
+        dict.__setitem__(self, key, value)
+        return value
+
+    def materialize(self):
+        for key in list(self._raw):
+            self._load(key)
+        return self
+
+    def raw_sections(self):
+        """Sections still undecoded: name → (codec, bytes)."""
+        return self._raw
+
+    # Lookup / mutation
+    def __missing__(self, key):
+        if key in self._raw:
+            return self._load(key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self._raw:
+            return self._load(key)
+        return dict.get(self, key, default)
+
+    def setdefault(self, key, default=None):
+        if key in self._raw:
+            return self._load(key)
+        return dict.setdefault(self, key, default)
+
+    def __contains__(self, key):
+        return key in self._raw or dict.__contains__(self, key)
+
+    def __setitem__(self, key, value):
+        self._raw.pop(key, None)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if self._raw.pop(key, None) is None:
+            dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        if key in self._raw:
+            self._load(key)
+        return dict.pop(self, key, *default)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    # Whole-dict views
+    def __iter__(self):
+        yield from dict.__iter__(self)
+        yield from list(self._raw)
+
+    def __len__(self):
+        return dict.__len__(self) + len(self._raw)
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return dict.items(self.materialize())
+
+    def values(self):
+        return dict.values(self.materialize())
+
+    def copy(self):
+        return dict(self.materialize())
+
+    def __eq__(self, other):
+        if isinstance(other, LazySaveData):
+            other.materialize()
+        return dict.__eq__(self.materialize(), other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"LazySaveData({dict.__repr__(self)}, undecoded={sorted(self._raw)})"
+
+
+# ------------------------------------------------------------
+# Codecs
+# ------------------------------------------------------------
+class JsonCodec:
+    name = "json"
+
+    def encode(self, data) -> bytes:
+        if isinstance(data, LazySaveData):
+            data.materialize()
+        return json.dumps(data, indent=2, default=_json_default).encode("utf-8")
+
+    def decode(self, payload: bytes):
+        return json.loads(payload.decode("utf-8"))
+
+
+class BinaryCodec:
+    name = "binary"
+
+    def __init__(self, use_msgpack=None):
+        if use_msgpack is None:
+            use_msgpack = msgpack is not None
+        if use_msgpack and msgpack is None:
+            raise ImportError("msgpack is not installed")
+        self.section_codec = SECTION_MSGPACK if use_msgpack else SECTION_JSON
+
+    def encode(self, data) -> bytes:
+        raw = data.raw_sections() if isinstance(data, LazySaveData) else {}
+        scalars = {}
+        sections = []   # (name, codec, payload)
+        for key in dict.keys(data):
+            value = dict.__getitem__(data, key)
+            if isinstance(value, (dict, list)) or hasattr(value, "to_json"):
+                sections.append((key, self.section_codec, _encode_section(value, self.section_codec)))
+            else:
+                scalars[key] = value
+        for key, (codec, payload) in raw.items():
+            sections.append((key, codec, payload))   # untouched: copy as is
+        sections.insert(0, ("", self.section_codec, _encode_section(scalars, self.section_codec)))
+
+        header = [_MAGIC, _COUNT.pack(len(sections))]
+        for name, codec, payload in sections:
+            name_bytes = name.encode("utf-8")
+            if len(name_bytes) > 255:
+                raise ValueError(f"Save section name too long: {name[:40]}...")
+            header.append(bytes((len(name_bytes),)) + name_bytes)
+            header.append(_SECTION.pack(codec, len(payload)))
+        return b"".join(header + [payload for _n, _c, payload in sections])
+
+    def decode(self, payload: bytes):
+        view = memoryview(payload)
+        if bytes(view[:len(_MAGIC)]) != _MAGIC:
+            raise ValueError("not a binary save")
+        offset = len(_MAGIC)
+        (count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        table = []
+        for _ in range(count):
+            length = view[offset]
+            name = bytes(view[offset + 1:offset + 1 + length]).decode("utf-8")
+            offset += 1 + length
+            codec, size = _SECTION.unpack_from(view, offset)
+            offset += _SECTION.size
+            table.append((name, codec, size))
+
+        eager, raw = {}, {}
+        for name, codec, size in table:
+            chunk = bytes(view[offset:offset + size])
+            if len(chunk) != size:
+                raise ValueError("binary save is truncated")
+            offset += size
+            if name == "":
+                eager.update(_decode_section(codec, chunk))
+            else:
+                raw[name] = (codec, chunk)
+        return LazySaveData(eager, raw)
+
+
+CODECS = {"json": JsonCodec(), "binary": BinaryCodec()}
+
+
+def get_codec(codec):
+    """A codec instance from a name ("json" / "binary") or the instance itself."""
+    if isinstance(codec, str):
+        try:
+            return CODECS[codec]
+        except KeyError:
+            raise ValueError(f"Unknown save codec: {codec}") from None
+    return codec
+
+
+def detect_codec(payload: bytes):
+    return CODECS["binary"] if payload.startswith(_MAGIC) else CODECS["json"]
+
+
+def decode_save(payload: bytes):
+    """Decode a snapshot in whichever format it was written."""
+    return detect_codec(payload).decode(payload)
+
+
+def read_save(path: str):
+    """Read and decode a snapshot file. Returns (data, codec)."""
+    with open(path, "rb") as f:
+        payload = f.read()
+    codec = detect_codec(payload)
+    return codec.decode(payload), codec
+
+
+# ------------------------------------------------------------
+# Benchmark
+# ------------------------------------------------------------
+def benchmark(data: dict, repeat: int = 100):
+    """Size and encode/decode/first-access timings per codec."""
+    codecs = [("json", CODECS["json"]), ("binary/json", BinaryCodec(use_msgpack=False))]
+    if msgpack is not None:
+        codecs.append(("binary/msgpack", BinaryCodec(use_msgpack=True)))
+
+    results = {}
+    for label, codec in codecs:
+        payload = codec.encode(data)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            codec.encode(data)
+        encode_ms = (time.perf_counter() - start) * 1000.0 / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            decoded = codec.decode(payload)
+        decode_ms = (time.perf_counter() - start) * 1000.0 / repeat
+
+        # Typical load path: read a couple of scalars and the flags only.
+        start = time.perf_counter()
+        for _ in range(repeat):
+            decoded = codec.decode(payload)
+            decoded.get("act")
+            decoded.get("flags")
+        flags_only_ms = (time.perf_counter() - start) * 1000.0 / repeat
+
+        # Re-save after touching only the flags section.
+        decoded = codec.decode(payload)
+        decoded.get("flags")
+        start = time.perf_counter()
+        for _ in range(repeat):
+            codec.encode(decoded)
+        resave_ms = (time.perf_counter() - start) * 1000.0 / repeat
+
+        results[label] = {
+            "bytes": len(payload),
+            "encode_ms": encode_ms,
+            "decode_ms": decode_ms,
+            "decode_flags_only_ms": flags_only_ms,
+            "resave_after_flags_ms": resave_ms,
+        }
+    return results
+
+
+def _synthetic_save(flags: int = 2000, tasks: int = 200):
+    """A large late-game-shaped save for benchmarking without a real one."""
+    return {
+        "player_name": "Student",
+        "act": 4,
+        "trust": 0.5,
+        "resonance": 42,
+        "schema_version": 1,
+        "last_scene": "act4/desktop",
+        "flags": {f"flag_{i}_complete": bool(i % 3) for i in range(flags)},
+        "tasks": [{"text": f"Task number {i}", "done": bool(i % 2)} for i in range(tasks)],
+        "settings": {"flash_effects": True},
+        "resonance_flags_seen": [f"flag_{i}_complete" for i in range(0, flags, 7)],
+        "visited_scenes": [f"act{i % 4 + 1}/scene_{i}" for i in range(300)],
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare save snapshot codecs")
+    parser.add_argument("save", nargs="?", help="snapshot to benchmark (default: synthetic)")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.save:
+        sample, _codec = read_save(args.save)
+        if isinstance(sample, LazySaveData):
+            sample.materialize()
+        sample = dict(sample)
+    else:
+        sample = _synthetic_save()
+
+    for label, row in benchmark(sample, args.repeat).items():
+        print(
+            f"{label:<15} {row['bytes']:>9} B  "
+            f"encode {row['encode_ms']:7.3f} ms  decode {row['decode_ms']:7.3f} ms  "
+            f"flags-only {row['decode_flags_only_ms']:7.3f} ms  "
+            f"re-save {row['resave_after_flags_ms']:7.3f} ms"
+        )
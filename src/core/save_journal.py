@@ -0,0 +1,160 @@
+# =========================================
+# file: src/core/save_journal.py
+# =========================================
+"""
+Crash-safe persistence helpers for GameState.
+
+A save is a compacted JSON snapshot (state.json) plus an append-only
+delta log next to it (state.json.log, one JSON record per line).
+Snapshots are written with temp-file + fsync + rename, so a crash can
+never leave a half-written state.json behind. Log records are small,
+absolute and idempotent, so replaying them on top of a snapshot that
+already contains them is harmless.
+
+Record shapes:
+    {"op": "set", "path": ["flags", "x"], "value": true}
+    {"op": "add", "path": ["resonance_flags_seen"], "value": "x"}
+    {"op": "task_add", "text": "..."}
+    {"op": "task_done", "text": "..."}
+"""
+
+import json
+import os
+
+
+def _fsync_dir(path: str):
+    """Best-effort fsync of the directory holding path (POSIX only)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: str, payload: bytes):
+    """Write payload to path via temp file + fsync + rename."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(path)
+
+
+def _json_default(obj):
+    """Let compact containers (e.g. FlagStore) choose their JSON form."""
+    to_json = getattr(obj, "to_json", None)
+    if callable(to_json):
+        return to_json()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def atomic_write_json(path: str, data):
+    """Write data as JSON to path atomically. Returns bytes written."""
+    payload = json.dumps(data, indent=2, default=_json_default).encode("utf-8")
+    atomic_write_bytes(path, payload)
+    return len(payload)
+
+
+def append_records(path: str, records):
+    """Append records to the delta log and fsync. Returns bytes written."""
+    if not records:
+        return 0
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    payload = "".join(
+        json.dumps(r, separators=(",", ":")) + "\n" for r in records
+    ).encode("utf-8")
+    with open(path, "ab") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    return len(payload)
+
+
+def read_records(path: str):
+    """
+    Read all intact records from the delta log.
+    A torn final line (crash mid-append) is ignored.
+    """
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line.decode("utf-8")))
+            except (ValueError, UnicodeDecodeError):
+                print(f"⚠ Skipping damaged save log record in {path}")
+                break
+    return records
+
+
+def truncate_log(path: str):
+    """Drop the delta log once its records are folded into a snapshot."""
+    if os.path.exists(path):
+        os.remove(path)
+        _fsync_dir(path)
+
+
+def log_size(path: str):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def apply_record(data: dict, record: dict):
+    """Apply one delta record to a state dict in place."""
+    op = record.get("op")
+    if op == "set":
+        *parents, leaf = record["path"]
+        target = data
+        for key in parents:
+            target = target.setdefault(key, {})
+        target[leaf] = record["value"]
+    elif op == "add":
+        *parents, leaf = record["path"]
+        target = data
+        for key in parents:
+            target = target.setdefault(key, {})
+        items = target.setdefault(leaf, [])
+        if record["value"] not in items:
+            items.append(record["value"])
+    elif op == "task_add":
+        tasks = data.setdefault("tasks", [])
+        if hasattr(tasks, "add"):   # indexed TaskList
+            tasks.add(record["text"])
+        elif not any(t["text"] == record["text"] for t in tasks):
+            tasks.append({"text": record["text"], "done": False})
+    elif op == "task_done":
+        tasks = data.get("tasks", [])
+        if hasattr(tasks, "complete"):
+            tasks.complete(record["text"])
+            return
+        for t in tasks:
+            if t["text"] == record["text"]:
+                t["done"] = True
+    else:
+        print(f"⚠ Unknown save log op: {op}")
+
+
+def replay(data: dict, records):
+    """Apply records in order on top of a snapshot dict."""
+    for record in records:
+        apply_record(data, record)
+    return data
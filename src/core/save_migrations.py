@@ -0,0 +1,348 @@
+# =========================================
+# file: src/core/save_migrations.py
+# =========================================
+"""
+Versioned save migrations for GameState.
+
+Every save stores a "schema_version". On load, GameState applies only
+the migrations newer than that version, so an up-to-date save skips all
+backfill work. Migrations operate on the plain save dict and must be
+idempotent (older saves may already contain some of the keys).
+
+Adding a new default flag or top-level key means appending a migration
+to MIGRATIONS — not editing an existing one — so saves that are
+already current still pick it up.
+
+The module also works as a batch tool for pre-migrating a directory of
+player saves (e.g. the QA corpus) across a process pool:
+    python -m src.save_migrations saves/ --workers 8 --report report.json
+"""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.flag_store import FLAG_REGISTRY, adopt_flags
+from src.save_codec import read_save
+from src.save_journal import atomic_write_bytes, read_records, replay, truncate_log
+
+
+# Core scene/app flags used throughout Acts 1–2 (and some later hooks)
+DEFAULT_FLAGS = {
+    # Lottie mission flow (Act 1)
+    "lottie_home_waiting": False,
+    "lottie_admin_assigned": False,
+    "lottie_home_sequence_complete": False,
+    "lottie_home_denied": False,
+    "pink_channel_synced": False,
+
+    # Lottie post-mission (Act 1)
+    "lottie_post_qna_complete": False,
+    "lottie_post_mission_greeted": False,
+    "lottie_creepy_event_done": False,
+
+    # Zooms (Act 1)
+    "timothy_zoom_complete": False,
+    "beatrice_zoom_complete": False,
+
+    # Assignments (Act 1)
+    "lottie_assignment1_complete": False,
+    "lottie_assignment2_complete": False,
+
+    # Desktop UX bits
+    "desktop_intro_shown": False,
+    "portal_reminder_shown": False,
+
+    # Misc discoveries / easter eggs
+    "terminal_388_found": False,
+    "hallway_freechat_typed": False,
+    "stain_discovered": False,
+    "stain_lottie_chat_done": False,
+
+    # --- NEW FLAGS FOR ACT 1 FLOW ---
+    "bluebird_complete": False,
+    "dorm_after_bluebird_complete": False,
+    "bluebird_signal_detected": False,
+    "act1_fast_forward": False,
+
+    # Hallway stealth sequence
+    "hallway_game_complete": False,   # main
+    "hallway_completed": False,       # legacy compatibility
+
+    # Control room
+    "control_room_complete": False,
+
+    # Admin desktop / narrative progression
+    "admin_intro_shown": False,
+    "admin_lottie_autostarted": False,
+    "dorm_brainmap_cache_received": False,
+    "neuroscan_unlocked": False,
+    "memory_core_downloaded": False,
+
+    # Lab / night mission hook
+    "lab_signal_relay_complete": False,
+
+    # Lux console channels
+    "lux_channel2_shown": False,
+    "lux_channel3_shown": False,
+    "lux_channel2_unlocked": False,
+    "lux_channel3_unlocked": False,
+
+    # Hangman lock / Neuroscan
+    "hangman_lock_solved": False,
+
+    # --- Act 2 flags ---
+    "talked_to_lottie_prezoom": False,
+    "dr_anand_zoom_complete": False,
+    "anand_suspicious": False,
+    "anand_assignment_complete": False,
+    "lottie_override_anand_question": False,
+
+    "dr_rachel_zoom_complete": False,
+    "rachel_assignment_complete": False,
+    "rachel_suspicious": False,
+
+    # Act 2 logoff + night mission
+    "act2_logoff_complete": False,
+    "lottie_lab_intro_complete": False,
+    "act2_night_mission_complete": False,
+    "act2_complete": False,
+
+    # Post-lab, Lottie update & dreams
+    "lottie_update2_complete": False,
+    "charlotte_dream_complete": False,
+
+    # --- Act 3 flags ---
+    # Lottie intro variants
+    "act3_lottie_intro_seen": False,
+    "act3_lottie_intro_locked": False,
+    "act3_lottie_intro_lowtrust_seen": False,
+    "desktop_act3_intro_shown": False,
+
+    # Zoom 3 completions
+    "timothy_zoom3_complete": False,
+    "beatrice_zoom3_complete": False,
+    "timothy_assignment_complete": False,
+
+    # Suspicion flags for all four profs (used in logoff router)
+    "timothy_suspicious": False,
+    "beatrice_suspicious": False,
+    # anand_suspicious / rachel_suspicious already defined above
+
+    # Logoff and betrayal
+    "act3_safe_logoff": False,
+    "act3_betrayal": False,
+    "act3_logoff_complete": False,
+    "act3_normal_logoff": False,
+    "force_interrogation": False,
+    "lottie_instruction_started" : False,
+    "lottie_instruction_complete" : False,
+    "act3_metaforest_started": False,
+    "act3_metaforest_complete": False,
+    "act3_channel3_flow_pending": False,
+    "act3_channel3_exit_ready": False,
+
+    # One-time bonuses / bookkeeping
+    "act2_trust_bonus_granted": False,
+
+    # --- Act 4 stable route flags ---
+    "act4_route": "unknown",
+    "act4_route_stable": False,
+    "act4_route_corrupted": False,
+    "act4_corrupted_reason": "",
+    "act4_lottie_stable_confirmed": False,
+    "act4_timothy_zoom4_complete": False,
+    "act4_beatrice_zoom4_complete": False,
+    "act4_optional_assignment_complete": False,
+    "act4_checkin_complete": False,
+    "act4_complete": False,
+    "act4_end_unlocked": False,
+}
+
+# Give the known flags the low bitset slots.
+for _name in DEFAULT_FLAGS:
+    FLAG_REGISTRY.slot(_name)
+
+
+def backfill_default_flags(data: dict):
+    """Add any DEFAULT_FLAGS missing from data["flags"]. Returns True if changed."""
+    flags = data.setdefault("flags", {})
+    changed = False
+    for k, v in DEFAULT_FLAGS.items():
+        if k not in flags:
+            flags[k] = v
+            changed = True
+    return changed
+
+
+def backfill_resonance(data: dict):
+    """Backfill resonance keys for older saves."""
+    changed = False
+    if "resonance" not in data:
+        data["resonance"] = 0
+        changed = True
+    if "resonance_flags_seen" not in data:
+        data["resonance_flags_seen"] = []
+        changed = True
+    return changed
+
+
+def backfill_scene_tracking(data: dict):
+    """Backfill scene tracking key for older saves."""
+    if "last_scene" not in data:
+        data["last_scene"] = None
+        return True
+    return False
+
+
+# ------------------------------------------------------------
+# Migration pipeline
+# ------------------------------------------------------------
+def _v1_backfill_baseline(data: dict):
+    """Pre-versioning saves: default flags, resonance and scene tracking."""
+    backfill_default_flags(data)
+    backfill_resonance(data)
+    backfill_scene_tracking(data)
+
+
+# (version, migration) in ascending order.
+MIGRATIONS = [
+    (1, _v1_backfill_baseline),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(data: dict):
+    return int(data.get("schema_version", 0))
+
+
+def pending_migrations(data: dict):
+    current = schema_version(data)
+    return [(v, fn) for v, fn in MIGRATIONS if v > current]
+
+
+def migrate(data: dict):
+    """
+    Apply pending migrations in place. Returns the list of versions
+    applied (empty when the save is already current).
+    """
+    applied = []
+    for version, fn in pending_migrations(data):
+        fn(data)
+        data["schema_version"] = version
+        applied.append(version)
+    return applied
+
+
+# ------------------------------------------------------------
+# Batch tool
+# ------------------------------------------------------------
+# Top-level keys every GameState save has had since before versioning.
+_SAVE_KEYS = ("flags", "act", "tasks", "player_name", "trust")
+
+
+def looks_like_save(data) -> bool:
+    """True for a dict with a flags table that is versioned or has the core keys."""
+    if not isinstance(data, dict) or not isinstance(data.get("flags"), dict):
+        return False
+    return "schema_version" in data or sum(1 for k in _SAVE_KEYS if k in data) >= 3
+
+
+def migrate_file(path: str, dry_run: bool = False):
+    """Migrate one save file (snapshot + delta log). Returns a report entry."""
+    start = time.perf_counter()
+    entry = {"path": path, "from_version": None, "applied": [], "error": None,
+             "skipped": None}
+    try:
+        data, codec = read_save(path)
+        if not looks_like_save(data):
+            entry["skipped"] = "not a save file"
+            entry["ms"] = (time.perf_counter() - start) * 1000.0
+            return entry
+        adopt_flags(data)
+        log_path = path + ".log"
+        had_log = os.path.exists(log_path)
+        if had_log:
+            replay(data, read_records(log_path))
+
+        entry["from_version"] = schema_version(data)
+        entry["applied"] = migrate(data)
+        if not dry_run and (entry["applied"] or had_log):
+            atomic_write_bytes(path, codec.encode(data))  # keep the file's format
+            truncate_log(log_path)
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    entry["ms"] = (time.perf_counter() - start) * 1000.0
+    return entry
+
+
+def _migrate_file_worker(args):
+    path, dry_run = args
+    return migrate_file(path, dry_run)
+
+
+def migrate_directory(directory: str, pattern: str = "**/*.json",
+                      workers=None, dry_run: bool = False, exclude=()):
+    """
+    Migrate every save under directory across a process pool. Files that
+    don't look like saves are left alone and reported as skipped; paths
+    in exclude (e.g. the tool's own report) are not touched at all.
+    """
+    excluded = {os.path.realpath(p) for p in exclude if p}
+    paths = sorted(
+        p for p in glob.glob(os.path.join(directory, pattern), recursive=True)
+        if os.path.realpath(p) not in excluded
+    )
+    start = time.perf_counter()
+    jobs = [(p, dry_run) for p in paths]
+    if workers == 1 or len(paths) < 2:
+        entries = [_migrate_file_worker(job) for job in jobs]
+    else:
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            entries = list(pool.map(_migrate_file_worker, jobs, chunksize=chunksize))
+
+    return {
+        "directory": directory,
+        "schema_version": SCHEMA_VERSION,
+        "dry_run": dry_run,
+        "total": len(entries),
+        "migrated": sum(1 for e in entries if e["applied"] and not e["error"]),
+        "up_to_date": sum(
+            1 for e in entries if not (e["applied"] or e["error"] or e["skipped"])
+        ),
+        "skipped": sum(1 for e in entries if e["skipped"]),
+        "failed": sum(1 for e in entries if e["error"]),
+        "elapsed_s": time.perf_counter() - start,
+        "files": entries,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Migrate a directory of saves")
+    parser.add_argument("directory")
+    parser.add_argument("--pattern", default="**/*.json")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--report", default=None, help="write the JSON report here")
+    args = parser.parse_args()
+
+    report = migrate_directory(
+        args.directory, args.pattern, workers=args.workers, dry_run=args.dry_run,
+        exclude=[args.report],
+    )
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    print(
+        f"[Migrate] {report['total']} files: {report['migrated']} migrated, "
+        f"{report['up_to_date']} up to date, {report['skipped']} not saves, "
+        f"{report['failed']} failed "
+        f"({report['elapsed_s']:.2f}s, schema v{SCHEMA_VERSION})"
+    )
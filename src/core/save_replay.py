@@ -0,0 +1,211 @@
+# =========================================
+# file: src/core/save_replay.py
+# =========================================
+"""
+Record GameState mutations as a replayable event stream.
+
+EventRecorder attaches to a GameState and appends one compact JSON line
+per committed mutation (the same records the save journal uses), stamped
+with seconds since recording started. Flag, trust, resonance, task and
+act changes, plus scene transitions (last_scene), are covered because
+they all go through GameState's mutators. The first line carries the
+full starting state, so a stream replays on its own. GameState.load()
+and reset(), load_into() and EventRecorder.attach() (switching to another
+slot's GameState) each write a new baseline line with the full state,
+and replay restarts from it:
+
+    recorder = EventRecorder(game_state, "bugreport/events.jsonl")
+    ...
+    recorder.close()
+
+    events = load_events("bugreport/events.jsonl")
+    state = state_at(events, t=42.0)                 # state 42s in
+    hit = first_event_where(events, lambda s: s["flags"].get("act3_betrayal"))
+
+Scenes that edit game_state.data directly and then call save() are only
+captured with capture_snapshots=True, which logs the full state at each
+save() (bigger streams, exact replays).
+
+CLI:
+    python -m src.save_replay events.jsonl --at 120
+    python -m src.save_replay events.jsonl --first-flag hallway_game_complete
+"""
+
+import json
+import time
+
+from src.flag_store import adopt_flags
+from src.save_journal import _json_default, apply_record
+
+# Events that carry the full state; replay restarts from the latest one.
+# GameState emits load/reset without a state and the recorder fills it in.
+BASELINE_OPS = ("begin", "load", "reset", "attach", "snapshot")
+
+
+class EventRecorder:
+    def __init__(self, game_state, path: str = None, capture_snapshots: bool = False):
+        self.game_state = game_state
+        self.path = path
+        self.capture_snapshots = capture_snapshots
+        self.events = [] if path is None else None   # in-memory when no path
+        self._file = open(path, "w", encoding="utf-8") if path else None
+        self._start = time.monotonic()
+        self.count = 0
+        self._write({"op": "begin", "state": _plain_state(game_state.data), "wall": time.time()})
+        game_state.event_sink = self
+
+    def emit(self, record):
+        """Called by GameState for every committed mutation record."""
+        op = record.get("op")
+        if op in BASELINE_OPS:
+            if op == "snapshot" and not self.capture_snapshots:
+                return
+            record = {"op": op, "state": _plain_state(self.game_state.data)}
+        self._write(dict(record))
+
+    def attach(self, game_state):
+        """Follow another GameState (e.g. a different save slot) from its current state."""
+        if self.game_state.event_sink is self:
+            self.game_state.event_sink = None
+        self.game_state = game_state
+        game_state.event_sink = self
+        self.emit({"op": "attach"})
+
+    def _write(self, event):
+        event["t"] = round(time.monotonic() - self._start, 4)
+        self.count += 1
+        if self._file is not None:
+            self._file.write(json.dumps(event, separators=(",", ":"), default=_json_default) + "\n")
+        else:
+            self.events.append(json.loads(json.dumps(event, default=_json_default)))
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self.game_state.event_sink is self:
+            self.game_state.event_sink = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _plain_state(data):
+    """A JSON-shaped deep copy of a state dict (FlagStore/TaskList → plain)."""
+    return json.loads(json.dumps(data, default=_json_default))
+
+
+# ------------------------------------------------------------
+# Replay
+# ------------------------------------------------------------
+def load_events(path: str):
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                print(f"⚠ Stopping at damaged event line in {path}")
+                break
+    return events
+
+
+def apply_event(state: dict, event: dict):
+    op = event.get("op")
+    if op in BASELINE_OPS:
+        state.clear()
+        state.update(_plain_state(event["state"]))
+        adopt_flags(state)   # flags as a FlagStore, like a loaded save
+    else:
+        apply_record(state, event)
+    return state
+
+
+def replay(events, upto: int = None, t: float = None, start: int = 0):
+    """
+    Yield (index, event, state) after applying each event from index
+    `start` (a baseline), stopping after index `upto` or the last event
+    at or before time `t`. The same state dict is updated in place, so
+    copy it if you keep it.
+    """
+    state = {}
+    for index in range(start, len(events)):
+        event = events[index]
+        if upto is not None and index > upto:
+            return
+        if t is not None and event.get("t", 0.0) > t:
+            return
+        apply_event(state, event)
+        yield index, event, state
+
+
+def state_at(events, upto: int = None, t: float = None):
+    """The state dict after replaying up to an event index or a time."""
+    state = {}
+    start = last_baseline(events, upto, t)
+    for _index, _event, state in replay(events, upto, t, start):
+        pass
+    return adopt_flags(_plain_state(state))
+
+
+def last_baseline(events, upto: int = None, t: float = None):
+    """Index of the last full-state event at or before the stop point (0 if none)."""
+    found = 0
+    for index, event in enumerate(events):
+        if upto is not None and index > upto:
+            break
+        if t is not None and event.get("t", 0.0) > t:
+            break
+        if event.get("op") in BASELINE_OPS and "state" in event:
+            found = index
+    return found
+
+
+def first_event_where(events, predicate):
+    """
+    Replay at full speed and return (index, event) of the first event
+    after which predicate(state) is true, or None. The state's flags are
+    a FlagStore, so predicates can use .get() as in game code.
+    """
+    for index, event, state in replay(events):
+        if predicate(state):
+            return index, event
+    return None
+
+
+def load_into(game_state, state: dict):
+    """Swap a replayed state into a live GameState (e.g. a headless run)."""
+    game_state.data = adopt_flags(_plain_state(state))
+    game_state.flag_epoch += 1
+    if game_state.event_sink is not None:
+        game_state.event_sink.emit({"op": "load"})
+    return game_state
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a GameState event stream")
+    parser.add_argument("events")
+    parser.add_argument("--at", type=float, help="seconds into the recording")
+    parser.add_argument("--index", type=int, help="event index to stop after")
+    parser.add_argument("--first-flag", help="find the first event that turns this flag on")
+    args = parser.parse_args()
+
+    stream = load_events(args.events)
+    start = time.perf_counter()
+    if args.first_flag:
+        hit = first_event_where(stream, lambda s: s["flags"].get(args.first_flag))
+        if hit is None:
+            print(f"'{args.first_flag}' never turns on in {len(stream)} events")
+        else:
+            index, event = hit
+            print(f"'{args.first_flag}' turns on at event {index} (t={event.get('t')}s): {event}")
+    else:
+        result = state_at(stream, upto=args.index, t=args.at)
+        print(json.dumps(result, indent=2, default=_json_default))
+    print(f"[Replay] {len(stream)} events in {(time.perf_counter() - start) * 1000:.1f} ms")
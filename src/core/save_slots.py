@@ -0,0 +1,239 @@
+# =========================================
+# file: src/core/save_slots.py
+# =========================================
+"""
+Save slots backed by a memory-mapped summary index.
+
+Each slot is an ordinary GameState save (save/slots/slot_03.json plus its
+delta log). Next to them, save/slots/index.bin holds one fixed-size
+record per slot with just what a load/continue menu shows: player name,
+act, trust, resonance, last scene and when it was saved. GameState
+rewrites its record in place on every flush, so listing slots never
+opens a save file, however many slots there are or however large they
+grow. The full save is only read when a slot is opened.
+
+    slots = SaveSlots()
+    for summary in slots.list_slots():
+        ...                           # draw the picker
+    game_state = slots.open_slot(summary.slot, write_behind=True)
+
+Layout (little-endian):
+    header   8s magic, H version, H record size, I capacity
+    record   B used, B act, 2x, f trust, d saved_at, i resonance,
+             32s player_name, 48s last_scene (UTF-8, NUL padded)
+"""
+
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+
+_MAGIC = b"SLOTIDX1"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHHI")
+_RECORD = struct.Struct("<BBxxfdi32s48s")
+
+SlotSummary = namedtuple(
+    "SlotSummary",
+    "slot player_name act trust resonance last_scene saved_at",
+)
+
+
+def _pack_text(text, size: int) -> bytes:
+    raw = str(text or "").encode("utf-8")[:size]
+    # Don't leave half a multi-byte character at the cut.
+    return raw.decode("utf-8", "ignore").encode("utf-8")
+
+
+def summarize(slot: int, data: dict, saved_at: float = None) -> SlotSummary:
+    """The index record for a state dict."""
+    return SlotSummary(
+        slot=slot,
+        player_name=str(data.get("player_name", "Student")),
+        act=int(data.get("act", 1)),
+        trust=float(data.get("trust", 0.5)),
+        resonance=int(data.get("resonance", 0)),
+        last_scene=data.get("last_scene") or "",
+        saved_at=time.time() if saved_at is None else saved_at,
+    )
+
+
+class SlotIndex:
+    """Fixed-layout slot summary table in a memory-mapped file."""
+
+    def __init__(self, path: str, capacity: int = 16):
+        self.path = path
+        self._file = None
+        self._map = None
+        self.capacity = 0
+        self.fresh = False   # True if _open created or reset the file
+        self._open(capacity)
+
+    def _open(self, capacity: int):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fresh = not os.path.exists(self.path)
+        self._file = open(self.path, "w+b" if fresh else "r+b")
+        if not fresh:
+            header = self._file.read(_HEADER.size)
+            try:
+                magic, version, record_size, stored = _HEADER.unpack(header)
+            except struct.error:   # truncated header
+                magic = version = record_size = None
+            if (magic, version, record_size) != (_MAGIC, _VERSION, _RECORD.size):
+                print(f"⚠ Slot index {self.path} is unreadable; rebuilding it")
+                fresh = True
+            else:
+                capacity = max(capacity, stored)
+        self.fresh = fresh
+        self._resize(capacity, clear=fresh)
+
+    def _resize(self, capacity: int, clear: bool = False):
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+        size = _HEADER.size + capacity * _RECORD.size
+        if clear:
+            self._file.seek(0)
+            self._file.truncate(0)
+        self._file.truncate(size)  # grows with zero bytes (= unused records)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._map[:_HEADER.size] = _HEADER.pack(_MAGIC, _VERSION, _RECORD.size, capacity)
+        self.capacity = capacity
+
+    def _offset(self, slot: int) -> int:
+        if slot < 0:
+            raise ValueError(f"Invalid save slot: {slot}")
+        if slot >= self.capacity:
+            self._resize(max(slot + 1, self.capacity * 2))
+        return _HEADER.size + slot * _RECORD.size
+
+    # ------------------------------------------------------------
+    # Records
+    # ------------------------------------------------------------
+    def read(self, slot: int):
+        """Summary for slot, or None if it is empty."""
+        if slot < 0 or slot >= self.capacity:
+            return None
+        offset = _HEADER.size + slot * _RECORD.size
+        used, act, trust, saved_at, resonance, name, scene = _RECORD.unpack_from(
+            self._map, offset
+        )
+        if not used:
+            return None
+        return SlotSummary(
+            slot=slot,
+            player_name=name.rstrip(b"\0").decode("utf-8", "replace"),
+            act=act,
+            trust=trust,
+            resonance=resonance,
+            last_scene=scene.rstrip(b"\0").decode("utf-8", "replace") or None,
+            saved_at=saved_at,
+        )
+
+    def write(self, summary: SlotSummary):
+        offset = self._offset(summary.slot)
+        _RECORD.pack_into(
+            self._map, offset,
+            1,
+            max(0, min(255, summary.act)),
+            summary.trust,
+            summary.saved_at,
+            summary.resonance,
+            _pack_text(summary.player_name, 32),
+            _pack_text(summary.last_scene, 48),
+        )
+
+    def update(self, slot: int, data: dict):
+        """Refresh slot's record from a state dict (called by GameState)."""
+        self.write(summarize(slot, data))
+
+    def clear(self, slot: int):
+        if 0 <= slot < self.capacity:
+            offset = _HEADER.size + slot * _RECORD.size
+            self._map[offset:offset + _RECORD.size] = bytes(_RECORD.size)
+
+    def summaries(self):
+        return [s for s in (self.read(i) for i in range(self.capacity)) if s]
+
+    def flush(self):
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self):
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SaveSlots:
+    def __init__(self, directory: str = "save/slots", capacity: int = 16):
+        self.directory = directory
+        index_path = os.path.join(directory, "index.bin")
+        self.index = SlotIndex(index_path, capacity)
+        if self.index.fresh:   # missing, or unreadable and reset
+            self.rebuild_index()
+
+    def path_for(self, slot: int) -> str:
+        return os.path.join(self.directory, f"slot_{slot:02d}.json")
+
+    def list_slots(self):
+        """Summaries of every used slot, from the index only."""
+        return self.index.summaries()
+
+    def summary(self, slot: int):
+        return self.index.read(slot)
+
+    def exists(self, slot: int) -> bool:
+        return self.index.read(slot) is not None or os.path.exists(self.path_for(slot))
+
+    def open_slot(self, slot: int, **kwargs):
+        """Load (or start) the GameState for slot."""
+        from src.game_state import GameState
+
+        return GameState(
+            save_file=self.path_for(slot),
+            slot_index=self.index,
+            slot=slot,
+            **kwargs,
+        )
+
+    def delete_slot(self, slot: int):
+        path = self.path_for(slot)
+        for p in (path, path + ".log"):
+            if os.path.exists(p):
+                os.remove(p)
+        self.index.clear(slot)
+
+    def rebuild_index(self):
+        """Recreate every record from the slot files (slow path, rarely needed)."""
+        if not os.path.isdir(self.directory):
+            return 0
+        from src.save_codec import read_save
+        from src.save_journal import read_records, replay
+
+        count = 0
+        for entry in sorted(os.listdir(self.directory)):
+            if not (entry.startswith("slot_") and entry.endswith(".json")):
+                continue
+            try:
+                slot = int(entry[5:-5])
+                path = os.path.join(self.directory, entry)
+                data, _codec = read_save(path)
+                replay(data, read_records(path + ".log"))
+            except (ValueError, OSError) as e:
+                print(f"⚠ Skipping save slot file {entry}: {e}")
+                continue
+            self.index.write(summarize(slot, data, os.path.getmtime(path)))
+            count += 1
+        self.index.flush()
+        return count
+
+    def close(self):
+        self.index.close()
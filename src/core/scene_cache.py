@@ -0,0 +1,96 @@
+# =========================================
+# file: src/core/scene_cache.py
+# =========================================
+"""
+SceneCache — LRU pool of suspended scene instances.
+
+Hub scenes (act1/desktop, act2/desktop, act3/desktop, ...) are expensive
+to rebuild and are revisited constantly, so SceneManager can park them
+here instead of throwing them away. Scenes opt in with a class attribute:
+    cache_scene = True
+and may implement the optional hooks:
+    on_suspend()      left the screen, kept warm in the cache
+    on_resume()       brought back from the cache
+    on_evict()        dropped from the cache; release assets here
+    memory_estimate() bytes held, for the budget (else surfaces are summed)
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+def estimate_scene_memory(scene) -> int:
+    """Bytes held by a scene: its own estimate, or its Surface attributes."""
+    estimate = getattr(scene, "memory_estimate", None)
+    if callable(estimate):
+        return int(estimate())
+    total = 0
+    for value in vars(scene).values():
+        if isinstance(value, pygame.Surface):
+            total += value.get_width() * value.get_height() * value.get_bytesize()
+    return total
+
+
+class SceneCache:
+    def __init__(self, capacity: int = 6, budget_bytes: int = 256 * 1024 * 1024):
+        self.capacity = capacity
+        self.budget_bytes = budget_bytes
+        self._scenes = OrderedDict()   # name → (scene, bytes), oldest first
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, name):
+        return name in self._scenes
+
+    def __len__(self):
+        return len(self._scenes)
+
+    def take(self, name):
+        """Remove and return the cached scene for name, or None."""
+        entry = self._scenes.pop(name, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        scene, size = entry
+        self.bytes_used -= size
+        return scene
+
+    def put(self, name, scene):
+        """Park a suspended scene, evicting the coldest ones over budget."""
+        old = self._scenes.pop(name, None)
+        if old is not None:
+            self.bytes_used -= old[1]
+            if old[0] is not scene:
+                _evict(old[0])
+
+        size = estimate_scene_memory(scene)
+        if size > self.budget_bytes:
+            _evict(scene)
+            return
+        self._scenes[name] = (scene, size)
+        self.bytes_used += size
+        self._enforce()
+
+    def clear(self):
+        while self._scenes:
+            _name, (scene, _size) = self._scenes.popitem(last=False)
+            _evict(scene)
+        self.bytes_used = 0
+
+    def _enforce(self):
+        while self._scenes and (
+            len(self._scenes) > self.capacity or self.bytes_used > self.budget_bytes
+        ):
+            name, (scene, size) = self._scenes.popitem(last=False)
+            self.bytes_used -= size
+            print(f"[SceneCache] Evicted '{name}' ({size // 1024} KiB)")
+            _evict(scene)
+
+
+def _evict(scene):
+    hook = getattr(scene, "on_evict", None)
+    if callable(hook):
+        hook()
@@ -1,4 +1,4 @@
- =========================================
+# =========================================
 # file: src/core/scene_flow_act1.py
 # =========================================
 """
@@ -7,75 +7,76 @@ Determines which scene to load next based on GameState flags.
 Integrates full end-of-Act-1 chain (GoBedScene → Act2DesktopScene).
 """
 
+import time
+
+from src.route_engine import ROUTES, Route, RouteTable
 from src.scene_registry import get_scene_by_name
 
 
+# Act 1 flow as a route table: the first guard flag that is not yet set
+# decides the next scene. Compiled once by the shared route engine.
+ACT1_ROUTES = RouteTable(
+    act=1,
+    routes=[
+        # --- Act 1 Start ---
+        Route("application_complete", "act1/application"),
+        # --- Desktop Hub unlocked after application ---
+        Route(
+            "desktop_unlocked", "act1/desktop",
+            effects=[("set_flag", "desktop_unlocked", True)],
+        ),
+        # --- Faculty Zooms & Assignments ---
+        Route("timothy_zoom_complete", "zoom_timothy"),
+        Route("lottie_assignment1_complete", "lottie"),
+        Route("beatrice_zoom_complete", "zoom_beatrice"),
+        Route("lottie_assignment2_complete", "lottie"),
+        # --- Log Off transition ---
+        Route("logoff_scene_complete", "act1/logoff"),
+        # --- Dorm / Bluebird Sequence ---
+        Route("bluebird_signal_detected", "act1/dorm"),
+        Route("bluebird_complete", "act1/bluebird_chat"),
+        Route("dorm_after_bluebird_complete", "act1/dorm_after_bluebird"),
+        # --- Hallway Puzzle + Control Room ---
+        Route("hallway_game_complete", "act1/hallway_game"),
+        Route("control_room_complete", "act1/control_room"),
+        # --- Closing Scenes ---
+        # Laptop → triggers Lottie update
+        Route("lottie_update_started", "act1/closing"),
+        # Bed → Go to Bed → Fade-out sequence
+        Route("act1_complete", "act1/go_to_bed"),
+    ],
+    # --- Act 2 Start ---
+    exit_scene="act2/desktop",
+    exit_effects=[("set_act", 2)],
+)
+ROUTES.register(ACT1_ROUTES)
+
+
 def next_scene_name(game_state):
     """
     Determine the next scene based on current GameState flags.
     Returns a string key (scene name) registered in scene_registry.py.
     """
-    f = game_state.data.get("flags", {})
-    act = game_state.data.get("act", 1)
-
-    if act != 1:
+    if game_state.data.get("act", 1) != 1:
         return None  # Only handles Act 1 progression
+    return ROUTES.next_scene_name(game_state)
 
-    # --- Act 1 Start ---
-    if not f.get("application_complete"):
-        return "act1/application"
-
-    # --- Desktop Hub unlocked after application ---
-    if not f.get("desktop_unlocked"):
-        game_state.set_flag("desktop_unlocked", True)
-        return "act1/desktop"
-
-    # --- Faculty Zooms & Assignments ---
-    if not f.get("timothy_zoom_complete"):
-        return "zoom_timothy"
-
-    if not f.get("lottie_assignment1_complete"):
-        return "lottie"
-
-    if not f.get("beatrice_zoom_complete"):
-        return "zoom_beatrice"
 
-    if not f.get("lottie_assignment2_complete"):
-        return "lottie"
-
-    # --- Log Off transition ---
-    if not f.get("logoff_scene_complete"):
-        return "act1/logoff"
-
-    # --- Dorm / Bluebird Sequence ---
-    if not f.get("bluebird_signal_detected"):
-        return "act1/dorm"
-
-    if not f.get("bluebird_complete"):
-        return "act1/bluebird_chat"
-
-    if not f.get("dorm_after_bluebird_complete"):
-        return "act1/dorm_after_bluebird"
-    # # --- Hallway Puzzle + Control Room ---
-    if not f.get("hallway_game_complete"):
-      return "act1/hallway_game"
-
-    if not f.get("control_room_complete"):
-       return "act1/control_room"
-
-    # # --- Closing Scenes ---
-    # # Laptop → triggers Lottie update
-    if not f.get("lottie_update_started"):
-        return "act1/closing"
+def predict_scene_names(game_state, hops: int = 2):
+    """
+    Side-effect-free lookahead: the next `hops` scenes Act 1 will route
+    to, assuming each predicted scene completes (sets its guard flag).
+    """
+    if game_state.data.get("act", 1) != 1:
+        return []
+    return ROUTES.predict(game_state, hops)
 
-    # # Bed → Go to Bed → Fade-out sequence
-    if not f.get("act1_complete"):
-        return "act1/go_to_bed"
 
-    # --- Act 2 Start ---
-    game_state.data["act"] = 2
-    game_state.save()
-    return "act2/act2_desktop"
+def _report_stall(scene_manager, next_name, start):
+    """Report the main-thread cost of resolving + building the next scene."""
+    prefetcher = getattr(scene_manager, "prefetcher", None)
+    if prefetcher:
+        prefetcher.record_transition(next_name, time.perf_counter() - start)
 
 
 # =========================================
@@ -90,6 +91,7 @@ def transition(scene_manager, window_manager):
         print("⚠ No valid next scene found for Act 1.")
         return
 
+    start = time.perf_counter()
     scene_class = get_scene_by_name(next_name)
     if not scene_class:
         print(f"⚠ Scene '{next_name}' not found in registry.")
@@ -99,13 +101,16 @@ def transition(scene_manager, window_manager):
     app_names = {"zoom_timothy", "zoom_beatrice", "lottie"}
     if next_name in app_names and window_manager:
         window_manager.open(scene_class, args={"game_state": window_manager.game_state})
+        _report_stall(scene_manager, next_name, start)
         return
 
-    # Instantiate and set new scene
+    # Instantiate (or resume a cached instance) and set new scene
     if window_manager:
-        scene_manager.set(scene_class(scene_manager, window_manager))
+        factory = lambda: scene_class(scene_manager, window_manager)
     else:
-        scene_manager.set(scene_class(scene_manager))
+        factory = lambda: scene_class(scene_manager)
+    scene_manager.set(scene_manager.obtain(next_name, factory))
+    _report_stall(scene_manager, next_name, start)
 
 # Flexible variant that supports App-style constructors
 def flex_transition(scene_manager, window_manager):
@@ -114,6 +119,7 @@ def flex_transition(scene_manager, window_manager):
         print("[SceneFlow] No valid next scene found for Act 1.")
         return
 
+    start = time.perf_counter()
     scene_class = get_scene_by_name(next_name)
     if not scene_class:
         print(f"[SceneFlow] Scene '{next_name}' not found in registry.")
@@ -121,7 +127,10 @@ def flex_transition(scene_manager, window_manager):
 
     try:
         # Only correct signature for all Act 1 scenes
-        instance = scene_class(scene_manager, window_manager)
+        instance = scene_manager.obtain(
+            next_name, lambda: scene_class(scene_manager, window_manager)
+        )
         scene_manager.set(instance)
+        _report_stall(scene_manager, next_name, start)
     except Exception as e:
         print(f"[SceneFlow] Failed to instantiate '{next_name}': {e}")
@@ -4,10 +4,26 @@
 """
 SceneManager — controls global scene transitions.
 Compatible with GameState, WindowManager, and scene_flow_act1 routing.
+Scenes that opt in (cache_scene = True) are suspended into an LRU
+SceneCache when replaced and resumed instead of rebuilt on revisit.
+
+Layered mode (SceneManager(layered=True)): when push() covers a scene,
+its last frame is rendered once into a cached surface (optionally
+dimmed / blurred) and every frame composites that backdrop under the
+live top scene, so menus and popups over expensive scenes cost one blit.
+A pushed scene can set covers_screen = True to skip the backdrop, or
+backdrop_dim / backdrop_blur to override the manager defaults.
 """
 
+import inspect
+import time
+
 import pygame
 
+from src.asset_manager import ASSETS
+from src.asset_stream import ASSET_STREAMER
+from src.scene_cache import SceneCache
+
 
 class SceneManager:
     """
@@ -18,8 +34,22 @@ class SceneManager:
         - draw(screen, dt)
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        scene_cache: SceneCache = None,
+        layered: bool = False,
+        backdrop_dim: int = 0,
+        backdrop_blur: int = 0,
+    ):
         self.stack = []  # active scene stack
+        self.layered = layered
+        self.backdrop_dim = backdrop_dim    # 0–255 black overlay alpha
+        self.backdrop_blur = backdrop_blur  # downscale factor, 0/1 = off
+        self._backdrops = {}  # covered scene → Surface (it + everything below)
+        self.prefetcher = None  # optional ScenePrefetcher, linked in run.py
+        self.scene_cache = scene_cache if scene_cache is not None else SceneCache()
+        self.assets = ASSETS  # shared asset cache for scenes
+        self.streamer = ASSET_STREAMER  # background loads, pumped in run.py
 
     # ------------------------------------------------------------
     # Basic stack controls
@@ -29,7 +59,14 @@ class SceneManager:
         Replace the current scene with a new one.
         """
         if scene:
+            outgoing = self.stack
             self.stack = [scene]
+            self._backdrops.clear()
+            # Only the old top is running; anything below was already
+            # suspended when it got covered by push().
+            for i, old in enumerate(reversed(outgoing)):
+                if old is not scene:
+                    self._park(old, suspend=(i == 0))
             self._record_scene(scene)
 
     def push(self, scene):
@@ -37,7 +74,11 @@ class SceneManager:
         Push a new scene on top of the stack (pauses previous).
         """
         if scene:
+            if self.stack:
+                _call_hook(self.stack[-1], "on_suspend")
             self.stack.append(scene)
+            if self.layered:
+                _invalidate_display(scene)
             self._record_scene(scene)
 
     def pop(self):
@@ -45,7 +86,12 @@ class SceneManager:
         Pop the top scene and return to the previous.
         """
         if self.stack:
-            self.stack.pop()
+            self._park(self.stack.pop())
+            if self.stack:
+                self._backdrops.pop(self.stack[-1], None)
+                if self.layered:
+                    _invalidate_display(self.stack[-1])
+                _call_hook(self.stack[-1], "on_resume")
             self._record_scene(self.current())
 
     def current(self):
@@ -54,6 +100,32 @@ class SceneManager:
         """
         return self.stack[-1] if self.stack else None
 
+    # ------------------------------------------------------------
+    # Scene cache (suspend / resume)
+    # ------------------------------------------------------------
+    def obtain(self, name: str, factory):
+        """
+        Return the warm cached scene registered as name (resuming it),
+        or build a new one with factory().
+        """
+        scene = self.scene_cache.take(name)
+        if scene is not None:
+            _call_hook(scene, "on_resume")
+            return scene
+        return factory()
+
+    def _park(self, scene, suspend: bool = True):
+        """Suspend a scene leaving the stack into the cache, if it opts in."""
+        if not getattr(scene, "cache_scene", False):
+            return
+        from src.scene_registry import get_scene_name_by_class
+        name = get_scene_name_by_class(scene.__class__)
+        if not name:
+            return
+        if suspend:
+            _call_hook(scene, "on_suspend")
+        self.scene_cache.put(name, scene)
+
     # ------------------------------------------------------------
     # Transition helper (automatic routing)
     # ------------------------------------------------------------
@@ -70,6 +142,7 @@ class SceneManager:
             print("⚠ No valid next scene found — transition aborted.")
             return
 
+        start = time.perf_counter()
         next_cls = get_scene_by_name(next_name)
         if not next_cls:
             print(f"⚠ Scene '{next_name}' not found in registry.")
@@ -77,7 +150,11 @@ class SceneManager:
 
         print(f"[SceneManager] Transitioning to → {next_name}")
         try:
-            self.set(next_cls(self, window_manager))
+            self.set(self.obtain(next_name, lambda: next_cls(self, window_manager)))
+            if self.prefetcher:
+                self.prefetcher.record_transition(
+                    next_name, time.perf_counter() - start
+                )
         except Exception as e:
             print(f"❌ Failed to instantiate scene '{next_name}': {e}")
 
@@ -104,15 +181,69 @@ class SceneManager:
         if hasattr(top, "update"):
             top.update(dt)
 
-    def draw(self, screen, dt):
+    def draw(self, screen, dt, alpha=None):
         """
         Draw the current scene.
+        alpha is the fixed-timestep interpolation factor. It is only
+        passed to scenes whose draw() has a parameter named alpha, or that
+        set draw_takes_alpha = True (then it is the third positional).
         """
         if not self.stack:
             return
         top = self.stack[-1]
-        if hasattr(top, "draw"):
-            top.draw(screen, dt)
+        if (
+            self.layered
+            and len(self.stack) > 1
+            and not getattr(top, "covers_screen", False)
+        ):
+            screen.blit(self._backdrop(len(self.stack) - 2, screen), (0, 0))
+        _draw_scene(top, screen, dt, alpha)
+
+    # ------------------------------------------------------------
+    # Layered mode: cached frames of covered scenes
+    # ------------------------------------------------------------
+    def refresh_backdrops(self):
+        """Re-capture covered scenes on the next draw (e.g. after a resize)."""
+        self._backdrops.clear()
+
+    def _backdrop(self, index: int, screen):
+        """Cached frame of stack[index] composited over everything below it."""
+        scene = self.stack[index]
+        surf = self._backdrops.get(scene)
+        if surf is not None and surf.get_size() == screen.get_size():
+            return surf
+
+        surf = pygame.Surface(screen.get_size())
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        if index > 0 and not getattr(scene, "covers_screen", False):
+            surf.blit(self._backdrop(index - 1, screen), (0, 0))
+
+        # A retained WindowManager only recomposes damaged regions; force a
+        # full compose into the capture and a full repaint afterwards.
+        _invalidate_display(scene)
+        _draw_scene(scene, surf, 0.0, None)
+        window_manager = getattr(scene, "window_manager", None)
+        if window_manager is not None and hasattr(window_manager, "take_frame_rects"):
+            window_manager.take_frame_rects()
+        _invalidate_display(scene)
+
+        cover = self.stack[index + 1]
+        blur = getattr(cover, "backdrop_blur", self.backdrop_blur)
+        dim = getattr(cover, "backdrop_dim", self.backdrop_dim)
+        if blur and blur > 1:
+            w, h = surf.get_size()
+            small = pygame.transform.smoothscale(
+                surf, (max(1, w // blur), max(1, h // blur))
+            )
+            surf = pygame.transform.smoothscale(small, (w, h))
+        if dim:
+            shade = pygame.Surface(surf.get_size(), pygame.SRCALPHA)
+            shade.fill((0, 0, 0, dim))
+            surf.blit(shade, (0, 0))
+
+        self._backdrops[scene] = surf
+        return surf
 
     def _record_scene(self, scene):
         if not scene:
@@ -128,7 +259,69 @@ class SceneManager:
             game_state = getattr(window_manager, "game_state", None)
             if not game_state:
                 return
-            game_state.data["last_scene"] = scene_name
-            game_state.save()
+            set_last_scene = getattr(game_state, "set_last_scene", None)
+            if callable(set_last_scene):
+                set_last_scene(scene_name)
+            else:
+                game_state.data["last_scene"] = scene_name
+                game_state.save()
+            # Scene transitions are the checkpoint for write-behind saves;
+            # otherwise set_last_scene() already wrote it and this is a no-op.
+            game_state.flush()
+            # Warm the next hop(s) while this scene runs.
+            if self.prefetcher:
+                self.prefetcher.schedule(game_state)
         except Exception:
             return
+
+
+def _draw_scene(scene, screen, dt, alpha):
+    if hasattr(scene, "draw"):
+        mode = _draw_takes_alpha(type(scene)) if alpha is not None else None
+        if mode == "keyword":
+            scene.draw(screen, dt, alpha=alpha)
+        elif mode == "positional":
+            scene.draw(screen, dt, alpha)
+        else:
+            scene.draw(screen, dt)
+
+
+def _invalidate_display(scene):
+    """Ask the scene's (retained) WindowManager for a full repaint."""
+    window_manager = getattr(scene, "window_manager", None)
+    invalidate = getattr(window_manager, "invalidate", None)
+    if callable(invalidate):
+        invalidate()
+
+
+def _call_hook(scene, hook_name):
+    hook = getattr(scene, hook_name, None)
+    if callable(hook):
+        hook()
+
+
+_DRAW_ALPHA_CACHE = {}
+
+
+def _draw_takes_alpha(scene_class):
+    """
+    How scene_class.draw wants alpha: "keyword" (it has a parameter
+    named alpha), "positional" (class opts in with draw_takes_alpha =
+    True) or None. Other extra parameters (e.g. debug=None) never
+    receive it. Cached per class.
+    """
+    cached = _DRAW_ALPHA_CACHE.get(scene_class, False)
+    if cached is False:
+        if getattr(scene_class, "draw_takes_alpha", False):
+            cached = "positional"
+        else:
+            try:
+                params = inspect.signature(scene_class.draw).parameters
+            except (TypeError, ValueError):
+                params = {}
+            alpha = params.get("alpha")
+            cached = "keyword" if alpha is not None and alpha.kind in (
+                alpha.POSITIONAL_OR_KEYWORD, alpha.KEYWORD_ONLY
+            ) else None
+        _DRAW_ALPHA_CACHE[scene_class] = cached
+    return cached
@@ -0,0 +1,140 @@
+# =========================================
+# file: src/core/scene_prefetch.py
+# =========================================
+"""
+ScenePrefetcher — warms the next scene(s) before a transition needs them.
+
+The Act 1 router is deterministic, so while the current scene runs we
+can ask it for the next one or two hops and get those scenes ready in
+the background of the frame loop. The transition itself then only
+constructs the scene.
+
+Scene modules load fonts and images at import time, and SDL_ttf /
+Surface.convert*() are not safe off the main thread. So imports happen
+on the main thread, from pump(), at most one scene per frame and only
+while the frame budget lasts. File I/O and decoding go to the
+AssetStreamer worker threads.
+
+Scenes declare the files they need up front, and the prefetcher streams
+them into the shared AssetManager:
+    preload_files = ["assets/dorm/bg.png", "assets/dorm/rain.ogg"]
+A scene can also add a hook, which runs on the main thread from pump():
+    @classmethod
+    def preload_assets(cls): ...
+"""
+
+import time
+from collections import deque
+
+from src.scene_registry import get_scene_by_name
+
+
+class ScenePrefetcher:
+    def __init__(self, hops: int = 2, router=None, verbose: bool = True,
+                 streamer=None, frame_budget_ms: float = 2.0):
+        if router is None:
+            from src.scene_flow_act1 import predict_scene_names
+            router = predict_scene_names
+        if streamer is None:
+            from src.asset_stream import ASSET_STREAMER
+            streamer = ASSET_STREAMER
+        self.hops = hops
+        self.router = router
+        self.verbose = verbose
+        self.streamer = streamer
+        self.frame_budget_ms = frame_budget_ms
+        self.stall_log = []  # [{"scene", "ms", "prefetched"}] per transition
+
+        self._queue = deque()
+        self._pending = set()
+        self._warmed = set()
+        self._loads = {}     # scene name → LoadGroup of its preload_files
+
+    # ------------------------------------------------------------
+    # Scheduling (main thread)
+    # ------------------------------------------------------------
+    def schedule(self, game_state):
+        """Predict the next hops from game_state and queue them for warming."""
+        for name in self.router(game_state, self.hops):
+            self.prefetch(name)
+
+    def prefetch(self, name: str):
+        if name in self._warmed or name in self._pending:
+            return
+        self._pending.add(name)
+        self._queue.append(name)
+
+    def is_warm(self, name: str) -> bool:
+        return name in self._warmed
+
+    def pump(self, budget_ms: float = None) -> int:
+        """
+        Warm queued scenes while the frame budget lasts. A scene's
+        import can't be split, so at most one scene is warmed per call.
+        Returns the number warmed.
+        """
+        if not self._queue:
+            return 0
+        budget = self.frame_budget_ms if budget_ms is None else budget_ms
+        start = time.perf_counter()
+        name = self._queue.popleft()
+        self._warm(name)
+        if self.verbose and (time.perf_counter() - start) * 1000.0 > budget:
+            print(f"[Prefetch] Warming '{name}' took longer than the {budget:.1f} ms budget")
+        return 1
+
+    def shutdown(self):
+        self._queue.clear()
+        self._pending.clear()
+        for group in self._loads.values():
+            group.release()
+        self._loads.clear()
+
+    # ------------------------------------------------------------
+    # Stall reporting
+    # ------------------------------------------------------------
+    def record_transition(self, name: str, seconds: float):
+        """Log how long the main thread spent resolving + building a scene."""
+        prefetched = self.is_warm(name)
+        entry = {"scene": name, "ms": seconds * 1000.0, "prefetched": prefetched}
+        self.stall_log.append(entry)
+        # The scene holds its own handles now; drop the prefetch ones.
+        group = self._loads.pop(name, None)
+        if group is not None:
+            group.release()
+        if self.verbose:
+            state = "prefetched" if prefetched else "cold"
+            print(f"[Prefetch] {name}: transition stall {entry['ms']:.1f} ms ({state})")
+
+    def stall_summary(self):
+        """Average stall in ms for cold vs prefetched transitions."""
+        summary = {}
+        for key, prefetched in (("cold", False), ("prefetched", True)):
+            times = [e["ms"] for e in self.stall_log if e["prefetched"] is prefetched]
+            summary[key] = {
+                "count": len(times),
+                "avg_ms": sum(times) / len(times) if times else 0.0,
+            }
+        return summary
+
+    # ------------------------------------------------------------
+    # Warming (main thread)
+    # ------------------------------------------------------------
+    def _warm(self, name: str):
+        warmed = False
+        try:
+            scene_class = get_scene_by_name(name)
+            if scene_class is not None:
+                files = getattr(scene_class, "preload_files", None)
+                if files and self.streamer is not None:
+                    self._loads[name] = self.streamer.load_group(files)
+                preload = getattr(scene_class, "preload_assets", None)
+                if callable(preload):
+                    preload()
+                warmed = True
+        except Exception as e:
+            print(f"[Prefetch] Failed to warm '{name}': {e}")
+        finally:
+            self._pending.discard(name)
+            if warmed:
+                self._warmed.add(name)
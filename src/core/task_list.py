@@ -0,0 +1,144 @@
+# =========================================
+# file: src/core/task_list.py
+# =========================================
+"""
+Indexed task list for GameState.
+
+TaskList is still the plain list of {"text": ..., "done": ...} dicts the
+save file has always held (it serializes unchanged), but it keeps a
+text → positions map and a pointer to the first incomplete task, so
+lookups, completion and active_task() are O(1) instead of scans.
+
+Go through add() / complete() / reopen() to change tasks; the index is
+kept up to date incrementally. Plain list mutations (append, del,
+slice assignment, ...) also work and just rebuild the index.
+"""
+
+
+class TaskList(list):
+    __slots__ = ("_index", "_first")
+
+    def __init__(self, items=()):
+        super().__init__(items)
+        self._rebuild()
+
+    def _rebuild(self):
+        self._index = {}
+        for i, task in enumerate(self):
+            self._index.setdefault(task.get("text"), []).append(i)
+        self._first = 0
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def find(self, text):
+        """The first task dict with this text, or None."""
+        positions = self._index.get(text)
+        return self[positions[0]] if positions else None
+
+    def active(self):
+        """Text of the first incomplete task, or None."""
+        # The pointer only ever moves past done tasks; reopen() moves it back.
+        first = self._first
+        while first < len(self) and self[first].get("done", False):
+            first += 1
+        self._first = first
+        return self[first]["text"] if first < len(self) else None
+
+    def all_done(self):
+        return self.active() is None
+
+    # ------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------
+    def add(self, text):
+        """Append a new incomplete task. False if the text already exists."""
+        if text in self._index:
+            return False
+        self._index[text] = [len(self)]
+        list.append(self, {"text": text, "done": False})
+        return True
+
+    def complete(self, text):
+        """Mark every task with this text done. True if any changed."""
+        changed = False
+        for i in self._index.get(text, ()):
+            task = self[i]
+            if not task.get("done", False):
+                task["done"] = True
+                changed = True
+        return changed
+
+    def reopen(self, text):
+        """Mark every task with this text not done."""
+        for i in self._index.get(text, ()):
+            self[i]["done"] = False
+            if i < self._first:
+                self._first = i
+
+    def remove_text(self, text):
+        """Drop the last task with this text (undoing add())."""
+        positions = self._index.get(text)
+        if positions:
+            del self[positions[-1]]
+
+    # ------------------------------------------------------------
+    # Plain list mutations: apply, then rebuild the index
+    # ------------------------------------------------------------
+    def append(self, task):
+        list.append(self, task)
+        self._index.setdefault(task.get("text"), []).append(len(self) - 1)
+
+    def __setitem__(self, key, value):
+        list.__setitem__(self, key, value)
+        self._rebuild()
+
+    def __delitem__(self, key):
+        list.__delitem__(self, key)
+        self._rebuild()
+
+    def __iadd__(self, other):
+        list.extend(self, other)
+        self._rebuild()
+        return self
+
+    def extend(self, items):
+        list.extend(self, items)
+        self._rebuild()
+
+    def insert(self, i, task):
+        list.insert(self, i, task)
+        self._rebuild()
+
+    def pop(self, i=-1):
+        task = list.pop(self, i)
+        self._rebuild()
+        return task
+
+    def remove(self, task):
+        list.remove(self, task)
+        self._rebuild()
+
+    def clear(self):
+        list.clear(self)
+        self._rebuild()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._rebuild()
+
+    def reverse(self):
+        list.reverse(self)
+        self._rebuild()
+
+    def copy(self):
+        return TaskList(dict(t) for t in self)
+
+
+def adopt_tasks(data: dict):
+    """Return data["tasks"] as a TaskList, converting it in place if needed."""
+    tasks = data.get("tasks")
+    if not isinstance(tasks, TaskList):
+        tasks = TaskList(tasks or [])
+        data["tasks"] = tasks
+    return tasks
@@ -0,0 +1,50 @@
+# =========================================
+# file: src/core/timestep.py
+# =========================================
+"""
+Fixed-timestep accumulator for the main loop.
+
+Simulation always advances in `step`-sized updates, independent of how
+fast frames are rendered. Long frames (save hitch, asset load) are
+clamped to max_frame_time and at most max_steps updates run per frame,
+so one slow frame can't turn into a giant dt spike or a spiral of
+catch-up updates. `alpha` is how far the renderer is between the last
+two simulation states (0.0–1.0), for interpolated drawing.
+"""
+
+
+class FixedTimestep:
+    def __init__(
+        self,
+        step: float = 1.0 / 60.0,
+        max_frame_time: float = 0.25,
+        max_steps: int = 5,
+    ):
+        self.step = step
+        self.max_frame_time = max_frame_time
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_time = 0.0  # simulation time discarded by the clamps
+
+    def advance(self, frame_time: float) -> int:
+        """Add elapsed frame time; return how many updates to run now."""
+        if frame_time > self.max_frame_time:
+            self.dropped_time += frame_time - self.max_frame_time
+            frame_time = self.max_frame_time
+        self.accumulator += frame_time
+
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            self.dropped_time += (steps - self.max_steps) * self.step
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.step
+        else:
+            self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        return self.accumulator / self.step
+
+    def reset(self):
+        self.accumulator = 0.0
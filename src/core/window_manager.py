@@ -11,11 +11,38 @@ project for portfolio demonstration purposes.
 """
 WindowManager — handles desktop apps, popups, and overlays.
 Integrates tightly with VirtualDesktop and GameState.
+
+Retained mode (opt-in, retained=True): instead of redrawing everything
+every frame, the manager asks the host desktop, the top window and each
+overlay for damage and only recomposes those regions. draw() then
+returns the rect list for pygame.display.update(rects). Damage protocol,
+checked in this order on each participant:
+    get_dirty_rects() -> list of rects changed since the last call
+    dirty (bool attribute, reset by the manager) + optional rect
+Anything implementing neither is assumed to change every frame.
+Retained composition only kicks in under a host desktop that speaks
+this protocol. Any other scene repaints the whole screen itself every
+frame. In that case the manager draws everything and take_frame_rects()
+returns None, so the loop flips.
+
+Event routing is indexed. An overlay may declare which events it wants:
+    event_types = {pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN}
+    hit_test_mouse = True   # mouse events only while the pointer is over rect
+Overlays without these get every event, as before. Overlay rects sit in
+a coarse grid for mouse hit-testing. The grid is rebuilt after open/close
+and once per update(); call invalidate_hit_index() if an overlay moves
+while it handles an event. MOUSEMOTION is coalesced to one event per
+frame.
 """
 
+import time
+
 import pygame
 from typing import Optional, TYPE_CHECKING
 
+from src.asset_manager import ASSETS, AssetManager
+from src.profiler import PROFILER
+
 if TYPE_CHECKING:
     from src.game_state import GameState
     from src.scene_manager import SceneManager
@@ -27,21 +54,46 @@ class WindowManager:
     Acts as a lightweight windowing layer for the Virtual Desktop.
     """
 
-    def __init__(self, screen: pygame.Surface, state: Optional["GameState"] = None):
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        state: Optional["GameState"] = None,
+        retained: bool = False,
+        assets: Optional[AssetManager] = None,
+    ):
         self.screen = screen
+        self.assets = assets if assets is not None else ASSETS  # shared asset cache
         self.state = state
         self.stack: list = []       # active main windows (apps)
-        self.overlays: list = []    # popups that draw above windows
+        self.overlays = []          # popups that draw above windows
         self.desktop = None         # set by VirtualDesktop
         self.game_state: Optional["GameState"] = None  # linked in run.py
         self.scene_manager: Optional["SceneManager"] = None  # linked in run.py
-        self.header_font = pygame.font.SysFont("Arial", 16, bold=True)
+        self._header_font_handle = self.assets.sysfont("Arial", 16, bold=True)
+        self.header_font = self._header_font_handle.value
         self.header_height = 26
         self.header_bg = (30, 60, 120)
         self.header_border = (15, 25, 60)
         self.header_text = (245, 245, 245)
         self.header_close_bg = (170, 60, 60)
         self.header_close_text = (255, 255, 255)
+        # app → (cache key, prerendered header surface)
+        self._header_cache: dict = {}
+
+        # Retained-mode bookkeeping
+        self.retained = retained
+        self._damage: list = []
+        self._full_damage = True
+        self._frame_rects = None  # rects from this frame's draw(), if retained
+
+        # Indexed event routing
+        self.coalesce_motion = True
+        self._pending_motion = None
+        self._routes: dict = {}         # event type → overlays, topmost first
+        self._z: dict = {}              # overlay → stacking index
+        self._routes_dirty = True       # set by self.overlays on any change
+        self._grid: dict = {}           # (cx, cy) → overlays with a rect there
+        self._grid_dirty = True
 
     # ------------------------------------------------------------
     # Window controls
@@ -60,20 +112,32 @@ class WindowManager:
             self.overlays.append(app)
         else:
             self.stack.append(app)
+        self.invalidate()
 
     def close(self, app=None):
         """Close an app or popup."""
+        self.invalidate()
         if app and app in self.overlays:
             self.overlays.remove(app)
         elif app and app in self.stack:
             self.stack.remove(app)
+            self._header_cache.pop(app, None)
         elif self.stack:
-            self.stack.pop()
+            app = self.stack.pop()
+            self._header_cache.pop(app, None)
+        else:
+            return
+        _release_assets(app)
 
     def close_all(self):
         """Close all apps and overlays."""
+        for app in self.stack + self.overlays:
+            _release_assets(app)
         self.stack.clear()
         self.overlays.clear()
+        self._header_cache.clear()
+        self._pending_motion = None
+        self.invalidate()
 
     # ------------------------------------------------------------
     # Event handling
@@ -82,15 +146,39 @@ class WindowManager:
         """
         Send events to topmost overlay or window.
         """
-        # overlays first (reverse order)
-        for overlay in reversed(self.overlays):
-            if hasattr(overlay, "handle_event"):
-                result = overlay.handle_event(event)
-                if result is True:
-                    return  # overlay consumed event
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if hasattr(overlay, "rect") and overlay.rect.collidepoint(event.pos):
-                        return
+        if event.type == pygame.MOUSEMOTION and self.coalesce_motion:
+            self._queue_motion(event)
+            return
+        self.flush_motion()
+        self._dispatch(event)
+
+    def _dispatch(self, event):
+        etype = event.type
+        if self._routes_dirty:
+            self._invalidate_routes()
+
+        # A click is blocked by the topmost overlay under the pointer.
+        hits = None
+        blocker_z = -1
+        if etype == pygame.MOUSEBUTTONDOWN:
+            hits = self._hits_at(event.pos)
+            z = self._z
+            blocker_z = max((z.get(o, -1) for o in hits), default=-1)
+
+        # overlays first (topmost first), only those subscribed to etype
+        for overlay in self._route_for(etype):
+            if blocker_z >= 0 and self._z.get(overlay, -1) < blocker_z:
+                break
+            if getattr(overlay, "hit_test_mouse", False) and hasattr(event, "pos"):
+                if hits is None:
+                    hits = self._hits_at(event.pos)
+                if overlay not in hits:
+                    continue
+            result = overlay.handle_event(event)
+            if result is True:
+                return  # overlay consumed event
+        if blocker_z >= 0:
+            return
 
         # then top window
         if self.stack:
@@ -98,11 +186,91 @@ class WindowManager:
             if hasattr(top, "handle_event"):
                 top.handle_event(event)
 
+    # ------------------------------------------------------------
+    # Event routing index
+    # ------------------------------------------------------------
+    _GRID_CELL = 128
+
+    def invalidate_hit_index(self):
+        """Call when an overlay's rect changes outside update()."""
+        self._grid_dirty = True
+
+    @property
+    def overlays(self):
+        return self._overlays
+
+    @overlays.setter
+    def overlays(self, items):
+        self._overlays = _OverlayList(self._mark_routes_dirty, items)
+        self._routes_dirty = True
+
+    def _mark_routes_dirty(self):
+        """Called by the overlay list on any add, remove, swap or reorder."""
+        self._routes_dirty = True
+
+    def _invalidate_routes(self):
+        self._routes.clear()
+        self._z = {o: i for i, o in enumerate(self.overlays)}
+        self._routes_dirty = False
+        self._grid_dirty = True
+
+    def _route_for(self, etype):
+        route = self._routes.get(etype)
+        if route is None:
+            route = tuple(
+                o for o in reversed(self.overlays)
+                if hasattr(o, "handle_event")
+                and (getattr(o, "event_types", None) is None or etype in o.event_types)
+            )
+            self._routes[etype] = route
+        return route
+
+    def _rebuild_grid(self):
+        cell = self._GRID_CELL
+        grid = {}
+        for overlay in self.overlays:
+            rect = getattr(overlay, "rect", None)
+            if rect is None or not hasattr(overlay, "handle_event"):
+                continue
+            for cx in range(rect.left // cell, (rect.right - 1) // cell + 1):
+                for cy in range(rect.top // cell, (rect.bottom - 1) // cell + 1):
+                    grid.setdefault((cx, cy), []).append(overlay)
+        self._grid = grid
+        self._grid_dirty = False
+
+    def _hits_at(self, pos):
+        """Overlays (with handle_event) whose rect contains pos."""
+        if self._grid_dirty:
+            self._rebuild_grid()
+        cell = self._GRID_CELL
+        candidates = self._grid.get((pos[0] // cell, pos[1] // cell), ())
+        return {o for o in candidates if o.rect.collidepoint(pos)}
+
+    def _queue_motion(self, event):
+        pending = self._pending_motion
+        if pending is None:
+            self._pending_motion = event
+            return
+        rel = getattr(pending, "rel", (0, 0))
+        new_rel = getattr(event, "rel", (0, 0))
+        attrs = dict(event.dict)
+        attrs["rel"] = (rel[0] + new_rel[0], rel[1] + new_rel[1])
+        self._pending_motion = pygame.event.Event(pygame.MOUSEMOTION, attrs)
+
+    def flush_motion(self):
+        """Deliver the coalesced MOUSEMOTION for this frame, if any."""
+        event = self._pending_motion
+        if event is not None:
+            self._pending_motion = None
+            self._dispatch(event)
+
     # ------------------------------------------------------------
     # Update + draw loop integration
     # ------------------------------------------------------------
     def update(self, dt: float):
         """Update all windows and overlays."""
+        self.flush_motion()
+        self._grid_dirty = True  # overlays may move during update
         if self.stack:
             top = self.stack[-1]
             if hasattr(top, "update"):
@@ -114,15 +282,122 @@ class WindowManager:
 
     def draw(self, screen: pygame.Surface, dt: float):
         """Draw windows and overlays."""
+        self.flush_motion()
+        if self.retained:
+            if _reports_damage(self.desktop):
+                return self._draw_retained(screen, dt)
+            # Nothing tracks what the scene underneath painted: compose
+            # everything and let the caller flip the whole frame.
+            self._frame_rects = None
+            self._full_damage = True
+
         if self.stack:
             top = self.stack[-1]
             if hasattr(top, "draw"):
-                top.draw(screen, dt)
+                self._draw_app(top, screen, dt)
             self._draw_window_header(top, screen)
 
         for overlay in self.overlays:
             if hasattr(overlay, "draw"):
-                overlay.draw(screen, dt)
+                self._draw_app(overlay, screen, dt)
+
+    def _draw_app(self, app, screen: pygame.Surface, dt: float):
+        if not PROFILER.enabled:
+            app.draw(screen, dt)
+            return
+        start = time.perf_counter()
+        app.draw(screen, dt)
+        PROFILER.record_window(
+            type(app).__name__, start, time.perf_counter() - start
+        )
+
+    # ------------------------------------------------------------
+    # Retained mode (dirty rects)
+    # ------------------------------------------------------------
+    def invalidate(self, rect=None):
+        """Mark a region (or, with no rect, the whole screen) for redraw."""
+        if rect is None:
+            self._full_damage = True
+        else:
+            self._damage.append(pygame.Rect(rect))
+
+    def take_frame_rects(self):
+        """
+        Rects composed by this frame's retained draw(), for
+        pygame.display.update(rects). None means "flip the whole frame"
+        (retained mode off, or draw() was not called this frame).
+        """
+        rects = self._frame_rects
+        self._frame_rects = None
+        if rects is None:
+            # Something else owned the display this frame; repaint fully
+            # the next time the manager composes.
+            self._full_damage = True
+        return rects
+
+    def _collect_damage(self, obj):
+        if obj is None:
+            return
+        get_rects = getattr(obj, "get_dirty_rects", None)
+        if callable(get_rects):
+            for r in get_rects() or ():
+                self._damage.append(pygame.Rect(r))
+            return
+        if hasattr(obj, "dirty"):
+            if obj.dirty:
+                obj.dirty = False
+                rect = getattr(obj, "rect", None)
+                if rect is None:
+                    self._full_damage = True
+                else:
+                    self._damage.append(pygame.Rect(rect))
+            return
+        # No damage protocol: assume it changes every frame.
+        self._full_damage = True
+
+    def _draw_retained(self, screen: pygame.Surface, dt: float):
+        screen_rect = screen.get_rect()
+
+        self._collect_damage(self.desktop)
+        if self.stack:
+            self._collect_damage(self.stack[-1])
+        for overlay in self.overlays:
+            self._collect_damage(overlay)
+
+        if self._full_damage:
+            rects = [screen_rect]
+        else:
+            rects = _merge_rects(
+                [r.clip(screen_rect) for r in self._damage], screen_rect
+            )
+        self._damage = []
+        self._full_damage = False
+
+        if not rects:
+            self._frame_rects = []
+            return []
+
+        region = rects[0].unionall(rects[1:]) if len(rects) > 1 else rects[0]
+        old_clip = screen.get_clip()
+        screen.set_clip(region)
+        try:
+            if self.stack:
+                top = self.stack[-1]
+                if hasattr(top, "draw"):
+                    self._draw_app(top, screen, dt)
+                self._draw_window_header(top, screen)
+
+            for overlay in self.overlays:
+                rect = getattr(overlay, "rect", None)
+                if rect is not None and not region.colliderect(rect):
+                    continue
+                if hasattr(overlay, "draw"):
+                    self._draw_app(overlay, screen, dt)
+        finally:
+            screen.set_clip(old_clip)
+
+        self._frame_rects = rects
+        return rects
 
     def _draw_window_header(self, app, screen: pygame.Surface) -> None:
         if getattr(app, "is_overlay", False):
@@ -134,10 +409,34 @@ class WindowManager:
 
         title = getattr(app, "window_title", app.__class__.__name__)
         rect = screen.get_rect()
-        bar_rect = pygame.Rect(rect.x, rect.y, rect.width, self.header_height)
-        pygame.draw.rect(screen, self.header_bg, bar_rect)
+        screen.blit(self._header_surface(app, title, rect.width), rect.topleft)
+
+    def _header_surface(self, app, title: str, width: int) -> pygame.Surface:
+        """
+        Return the prerendered header for app, re-rendering only when the
+        title, width, font or theme colors change.
+        """
+        key = (
+            title,
+            width,
+            self.header_height,
+            id(self.header_font),
+            self.header_bg,
+            self.header_border,
+            self.header_text,
+            self.header_close_bg,
+            self.header_close_text,
+        )
+        cached = self._header_cache.get(app)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        # One extra row so the 2px border line isn't clipped.
+        surf = pygame.Surface((width, self.header_height + 1), pygame.SRCALPHA)
+        bar_rect = pygame.Rect(0, 0, width, self.header_height)
+        pygame.draw.rect(surf, self.header_bg, bar_rect)
         pygame.draw.line(
-            screen,
+            surf,
             self.header_border,
             (bar_rect.left, bar_rect.bottom - 1),
             (bar_rect.right, bar_rect.bottom - 1),
@@ -145,12 +444,114 @@ class WindowManager:
         )
 
         title_surf = self.header_font.render(title, True, self.header_text)
-        screen.blit(title_surf, (bar_rect.x + 8, bar_rect.y + 4))
+        surf.blit(title_surf, (bar_rect.x + 8, bar_rect.y + 4))
 
         close_rect = pygame.Rect(bar_rect.right - 26, bar_rect.y + 4, 18, 18)
-        pygame.draw.rect(screen, self.header_close_bg, close_rect, border_radius=3)
+        pygame.draw.rect(surf, self.header_close_bg, close_rect, border_radius=3)
         x_surf = self.header_font.render("X", True, self.header_close_text)
-        screen.blit(
+        surf.blit(
             x_surf,
             x_surf.get_rect(center=close_rect.center),
         )
+
+        self._header_cache[app] = (key, surf)
+        return surf
+
+
+def _merge_rects(rects, screen_rect, full_ratio: float = 0.5):
+    """
+    Merge overlapping damage rects. Collapses to the full screen once the
+    damaged area passes full_ratio, where one big update is cheaper.
+    """
+    merged = []
+    for rect in rects:
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        rect = rect.copy()
+        i = 0
+        while i < len(merged):
+            if merged[i].colliderect(rect):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+
+    area = sum(r.width * r.height for r in merged)
+    if area >= screen_rect.width * screen_rect.height * full_ratio:
+        return [screen_rect.copy()]
+    return merged
+
+
+class _OverlayList(list):
+    """
+    WindowManager.overlays: a plain list that reports every mutation, so
+    scenes can push, pop, swap or reorder overlays directly and the event
+    route index is rebuilt once, on the next dispatch.
+    """
+
+    __slots__ = ("_changed",)
+
+    def __init__(self, on_change, items=()):
+        super().__init__(items)
+        self._changed = on_change
+
+    def append(self, item):
+        list.append(self, item)
+        self._changed()
+
+    def extend(self, items):
+        list.extend(self, items)
+        self._changed()
+
+    def insert(self, i, item):
+        list.insert(self, i, item)
+        self._changed()
+
+    def remove(self, item):
+        list.remove(self, item)
+        self._changed()
+
+    def pop(self, i=-1):
+        item = list.pop(self, i)
+        self._changed()
+        return item
+
+    def clear(self):
+        list.clear(self)
+        self._changed()
+
+    def reverse(self):
+        list.reverse(self)
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._changed()
+
+    def __setitem__(self, key, value):
+        list.__setitem__(self, key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        list.__delitem__(self, key)
+        self._changed()
+
+    def __iadd__(self, items):
+        list.extend(self, items)
+        self._changed()
+        return self
+
+
+def _reports_damage(obj) -> bool:
+    """True if obj implements the retained-mode damage protocol."""
+    return obj is not None and (
+        callable(getattr(obj, "get_dirty_rects", None)) or hasattr(obj, "dirty")
+    )
+
+
+def _release_assets(app):
+    """Closed apps give their AssetManager handles back (optional hook)."""
+    hook = getattr(app, "release_assets", None)
+    if callable(hook):
+        hook()
@@ -0,0 +1,25 @@
+# =========================================
+# file: tests/conftest.py
+# =========================================
+"""
+The engine modules live in src/core but import each other as src.<name>
+(the layout of the larger project they were extracted from). Point the
+src namespace package at src/core so the tests can import them the
+same way, and keep pygame on its dummy drivers.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import src  # noqa: E402  (namespace package)
+
+CORE = os.path.join(ROOT, "src", "core")
+if CORE not in list(src.__path__):
+    src.__path__.append(CORE)
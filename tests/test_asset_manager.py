@@ -0,0 +1,72 @@
+# =========================================
+# file: tests/test_asset_manager.py
+# =========================================
+"""AssetManager.acquire: loaders run outside the lock, once per key."""
+
+import threading
+
+import pytest
+
+from src.asset_manager import AssetManager
+
+
+def _slow_loader(started, release, calls, value="slow"):
+    def load():
+        calls.append(value)
+        started.set()
+        assert release.wait(5)
+        return value
+    return load
+
+
+def test_slow_load_does_not_block_other_keys():
+    assets = AssetManager()
+    started, release, calls = threading.Event(), threading.Event(), []
+    worker = threading.Thread(
+        target=assets.acquire, args=("slow", _slow_loader(started, release, calls)),
+        kwargs={"size": 1},
+    )
+    worker.start()
+    try:
+        assert started.wait(5)
+        # The manager lock is free while "slow" loads.
+        handle = assets.acquire("fast", lambda: "fast", size=1)
+        assert handle.value == "fast"
+        assert "slow" not in assets
+    finally:
+        release.set()
+        worker.join(5)
+    assert "slow" in assets
+
+
+def test_concurrent_requests_for_one_key_share_one_load():
+    assets = AssetManager()
+    started, release, calls = threading.Event(), threading.Event(), []
+    loader = _slow_loader(started, release, calls)
+    handles = []
+    threads = [
+        threading.Thread(target=lambda: handles.append(assets.acquire("k", loader, size=1)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    assert started.wait(5)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert calls == ["slow"]
+    assert [h.value for h in handles] == ["slow"] * 4
+    assert assets.report()["loads"] == 1 and assets.report()["hits"] == 3
+    assert assets._entries["k"].refs == 4
+
+
+def test_failed_load_releases_the_key():
+    assets = AssetManager()
+
+    def broken():
+        raise OSError("missing file")
+
+    with pytest.raises(OSError):
+        assets.acquire("k", broken, size=1)
+    assert "k" not in assets and not assets._loading
+    assert assets.acquire("k", lambda: "ok", size=1).value == "ok"
@@ -0,0 +1,79 @@
+# =========================================
+# file: tests/test_flag_store.py
+# =========================================
+"""FlagStore: mapping behaviour, JSON round-trip, old plain-dict saves."""
+
+import json
+
+from src.flag_store import FlagStore, adopt_flags
+from src.game_state import GameState
+from src.save_journal import _json_default
+
+
+def _round_trip(store):
+    payload = json.dumps({"flags": store}, default=_json_default)
+    return adopt_flags(json.loads(payload))["flags"]
+
+
+def test_mapping_protocol_matches_a_dict():
+    flags = FlagStore({"a": True, "b": False, "act4_route": "unknown"})
+    assert dict(flags) == {"a": True, "b": False, "act4_route": "unknown"}
+    assert flags.get("missing") is None and "missing" not in flags
+    flags["act4_route"] = True          # non-bool → bool moves it into the bitset
+    del flags["b"]
+    assert dict(flags) == {"a": True, "act4_route": True}
+    assert len(flags) == 2
+
+
+def test_json_round_trip_preserves_every_value():
+    flags = FlagStore({
+        "on_flag": True,
+        "off_flag": False,
+        "act4_route": "unknown",
+        "counter": 3,
+        "has space": True,               # can't go in the space-separated lists
+    })
+    encoded = flags.to_json()
+    assert encoded["__flagset__"] == 1
+    assert encoded["on"].split() == ["on_flag"]
+    assert encoded["off"].split() == ["off_flag"]
+
+    restored = _round_trip(flags)
+    assert isinstance(restored, FlagStore)
+    assert dict(restored) == dict(flags)
+    assert restored["off_flag"] is False and restored["has space"] is True
+
+
+def test_plain_dict_save_is_adopted_and_rewritten_compactly(tmp_path):
+    path = tmp_path / "state.json"
+    legacy = {
+        "player_name": "Student", "act": 1, "trust": 0.5,
+        "flags": {"application_complete": True, "desktop_unlocked": False},
+        "tasks": [],
+    }
+    path.write_text(json.dumps(legacy))
+
+    gs = GameState(str(path))
+    assert isinstance(gs.data["flags"], FlagStore)
+    assert gs.get_flag("application_complete") is True
+    assert gs.get_flag("desktop_unlocked") is False
+
+    gs.save()
+    on_disk = json.loads(path.read_text())["flags"]
+    assert on_disk["__flagset__"] == 1
+    assert "application_complete" in on_disk["on"].split()
+    assert GameState(str(path)).get_flag("application_complete") is True
+
+
+def test_version_bumps_only_when_a_flag_turns_off():
+    flags = FlagStore({"a": False})
+    flags["a"] = True
+    flags["b"] = True
+    assert flags.version == 0
+    flags["a"] = False
+    assert flags.version == 1
+    flags["a"] = False                  # already off
+    assert flags.version == 1
+    del flags["b"]
+    assert flags.version == 2
+    assert flags.copy().version == 2
@@ -0,0 +1,120 @@
+# =========================================
+# file: tests/test_route_engine.py
+# =========================================
+"""Act 1 routing: table/lookup equivalence with the original if-chain, cursors."""
+
+import itertools
+import json
+
+import pytest
+
+from src.flag_store import FlagStore
+from src.game_state import GameState
+from src.route_engine import ROUTES
+from src.route_graph import analyze, write_artifact
+from src.scene_flow_act1 import ACT1_ROUTES
+
+
+def baseline_next_scene(f):
+    """The hand-written Act 1 if-chain the route table replaced (without effects)."""
+    if not f.get("application_complete"):
+        return "act1/application"
+    if not f.get("desktop_unlocked"):
+        return "act1/desktop"
+    if not f.get("timothy_zoom_complete"):
+        return "zoom_timothy"
+    if not f.get("lottie_assignment1_complete"):
+        return "lottie"
+    if not f.get("beatrice_zoom_complete"):
+        return "zoom_beatrice"
+    if not f.get("lottie_assignment2_complete"):
+        return "lottie"
+    if not f.get("logoff_scene_complete"):
+        return "act1/logoff"
+    if not f.get("bluebird_signal_detected"):
+        return "act1/dorm"
+    if not f.get("bluebird_complete"):
+        return "act1/bluebird_chat"
+    if not f.get("dorm_after_bluebird_complete"):
+        return "act1/dorm_after_bluebird"
+    if not f.get("hallway_game_complete"):
+        return "act1/hallway_game"
+    if not f.get("control_room_complete"):
+        return "act1/control_room"
+    if not f.get("lottie_update_started"):
+        return "act1/closing"
+    if not f.get("act1_complete"):
+        return "act1/go_to_bed"
+    return "act2/desktop"
+
+
+class _State:
+    def __init__(self, flags):
+        self.data = {"act": 1, "flags": flags}
+
+
+def _all_configs():
+    guards = ACT1_ROUTES.guard_flags
+    for bits in itertools.product((False, True), repeat=len(guards)):
+        yield dict(zip(guards, bits))
+
+
+@pytest.fixture
+def lookup_installed():
+    ACT1_ROUTES.install_lookup(ACT1_ROUTES.decisions())
+    yield
+    ACT1_ROUTES.install_lookup(None)
+
+
+def test_table_matches_baseline_for_every_flag_configuration():
+    for config in _all_configs():
+        expected = baseline_next_scene(config)
+        assert ROUTES.peek(_State(FlagStore(config))) == expected, config
+        assert ROUTES.peek(_State(dict(config))) == expected, config
+
+
+def test_lookup_matches_baseline_for_every_flag_configuration(lookup_installed):
+    assert ACT1_ROUTES.has_lookup
+    for config in _all_configs():
+        assert ROUTES.peek(_State(FlagStore(config))) == baseline_next_scene(config), config
+
+
+def test_lookup_artifact_round_trip_and_stale_entries(tmp_path):
+    path = str(tmp_path / "routes.json")
+    write_artifact(analyze(), path)
+    try:
+        assert ROUTES.load_lookup(path) == 1
+        assert ACT1_ROUTES.has_lookup
+
+        ACT1_ROUTES.install_lookup(None)
+        with open(path) as f:
+            report = json.load(f)
+        report["tables"]["1"]["fingerprint"] = "stale"
+        with open(path, "w") as f:
+            json.dump(report, f)
+        assert ROUTES.load_lookup(path) == 0
+        assert not ACT1_ROUTES.has_lookup
+    finally:
+        ACT1_ROUTES.install_lookup(None)
+
+
+def test_cursor_sees_direct_writes_that_clear_a_flag(tmp_path):
+    gs = GameState(str(tmp_path / "state.json"))
+    for flag in ACT1_ROUTES.guard_flags[:6]:
+        gs.set_flag(flag, True)
+    assert ROUTES.peek(gs) == "act1/logoff"          # cursor now past the zooms
+
+    gs.data["flags"]["timothy_zoom_complete"] = False  # bypasses set_flag
+    assert ROUTES.peek(gs) == baseline_next_scene(gs.data["flags"]) == "zoom_timothy"
+
+    del gs.data["flags"]["application_complete"]
+    assert ROUTES.peek(gs) == "act1/application"
+
+
+def test_cursor_resets_when_the_flag_store_is_replaced(tmp_path):
+    gs = GameState(str(tmp_path / "state.json"))
+    for flag in ACT1_ROUTES.guard_flags[:6]:
+        gs.set_flag(flag, True)
+    assert ROUTES.peek(gs) == "act1/logoff"
+    gs.data["flags"] = FlagStore()
+    assert ROUTES.peek(gs) == "act1/application"
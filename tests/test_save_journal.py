@@ -0,0 +1,82 @@
+# =========================================
+# file: tests/test_save_journal.py
+# =========================================
+"""Snapshot + delta log persistence: torn logs, compaction, damaged saves."""
+
+import errno
+import glob
+import os
+
+import pytest
+
+import src.game_state as game_state_module
+from src.game_state import GameState
+from src.save_journal import append_records, read_records
+
+
+@pytest.fixture
+def save_path(tmp_path):
+    return str(tmp_path / "state.json")
+
+
+def test_torn_log_tail_is_ignored(tmp_path):
+    log = str(tmp_path / "state.json.log")
+    append_records(log, [{"op": "set", "path": ["flags", "a"], "value": True}])
+    with open(log, "ab") as f:
+        f.write(b'{"op":"set","path":["flags","b"],"val')   # crash mid-append
+    assert read_records(log) == [{"op": "set", "path": ["flags", "a"], "value": True}]
+
+
+def test_log_replays_on_load_and_is_folded_into_the_snapshot(save_path):
+    gs = GameState(save_path)
+    gs.set_flag("replayed_flag", True)
+    assert os.path.exists(save_path + ".log")
+
+    with open(save_path + ".log", "ab") as f:
+        f.write(b'{"op":"set","path":["flags","torn"')
+
+    loaded = GameState(save_path)
+    assert loaded.get_flag("replayed_flag") is True
+    assert loaded.get_flag("torn") is False
+    assert not os.path.exists(save_path + ".log")
+    assert not os.path.exists(save_path + ".tmp")
+
+
+def test_compaction_keeps_every_change(save_path):
+    gs = GameState(save_path, log_compact_bytes=256)
+    for i in range(40):
+        gs.set_flag(f"compact_{i}", True)
+    assert gs.io_stats["snapshots"] > 1        # the log was folded at least once
+
+    loaded = GameState(save_path)
+    assert all(loaded.get_flag(f"compact_{i}") for i in range(40))
+
+
+def test_write_error_while_folding_the_log_keeps_the_save(save_path, monkeypatch):
+    gs = GameState(save_path)
+    gs.change_trust(+0.2)
+    gs.set_flag("keep_me", True)
+    trust = gs.get_trust()
+
+    def disk_full(*args, **kwargs):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(game_state_module, "atomic_write_bytes", disk_full)
+    with pytest.raises(OSError):
+        GameState(save_path)
+    monkeypatch.undo()
+
+    loaded = GameState(save_path)
+    assert loaded.get_flag("keep_me") is True
+    assert loaded.get_trust() == trust
+    assert glob.glob(save_path + ".corrupt*") == []
+
+
+def test_damaged_saves_get_separate_backups(save_path):
+    GameState(save_path)
+    for _ in range(2):
+        with open(save_path, "w") as f:
+            f.write("{not json")
+        gs = GameState(save_path)
+        assert gs.data["act"] == 1
+    assert len(glob.glob(save_path + ".corrupt-*")) == 2
@@ -0,0 +1,72 @@
+# =========================================
+# file: tests/test_save_replay.py
+# =========================================
+"""EventRecorder baselines: replay across load(), reset() and slot swaps."""
+
+import pytest
+
+from src.game_state import GameState
+from src.save_replay import EventRecorder, first_event_where, last_baseline, state_at
+
+
+@pytest.fixture
+def game_state(tmp_path):
+    return GameState(str(tmp_path / "state.json"))
+
+
+def test_reset_writes_a_baseline_replay_starts_from(game_state):
+    recorder = EventRecorder(game_state)
+    game_state.set_flag("before_reset", True)
+    game_state.reset()
+    game_state.set_flag("after_reset", True)
+
+    events = recorder.events
+    assert [e["op"] for e in events].count("reset") == 1
+    assert last_baseline(events) == [e["op"] for e in events].index("reset")
+    final = state_at(events)
+    assert final == state_at(events[last_baseline(events):])
+    assert final["flags"].get("after_reset") is True
+    assert "before_reset" not in final["flags"]
+    assert dict(final["flags"]) == dict(game_state.data["flags"])
+
+
+def test_load_baseline_matches_the_reloaded_state(game_state):
+    recorder = EventRecorder(game_state)
+    game_state.set_flag("saved", True)
+    game_state.data["flags"]["unsaved_direct_write"] = True   # not recorded
+    game_state.load()
+
+    events = recorder.events
+    assert events[-1]["op"] == "load"
+    final = state_at(events)
+    assert "unsaved_direct_write" not in final["flags"]
+    assert dict(final["flags"]) == dict(game_state.data["flags"])
+    # Earlier points still replay from the original begin line.
+    index, _event = first_event_where(events, lambda s: s["flags"].get("saved"))
+    assert state_at(events, upto=index)["flags"].get("saved") is True
+
+
+def test_attach_follows_another_slot(game_state, tmp_path):
+    recorder = EventRecorder(game_state)
+    game_state.set_flag("slot_a_flag", True)
+    other = GameState(str(tmp_path / "slot_b.json"))
+    other.set_flag("slot_b_flag", True)
+
+    recorder.attach(other)
+    game_state.set_flag("ignored_after_swap", True)
+    other.set_flag("recorded_after_swap", True)
+
+    assert game_state.event_sink is None and other.event_sink is recorder
+    final = state_at(recorder.events)
+    assert final["flags"].get("slot_b_flag") and final["flags"].get("recorded_after_swap")
+    assert "slot_a_flag" not in final["flags"]
+    assert "ignored_after_swap" not in final["flags"]
+
+
+def test_progression_setters_append_instead_of_rewriting(game_state):
+    snapshots = game_state.io_stats["snapshots"]
+    game_state.set_last_scene("desktop")
+    game_state.set_act(2)
+    assert game_state.io_stats["snapshots"] == snapshots
+    reloaded = GameState(game_state.save_file)
+    assert (reloaded.data["last_scene"], reloaded.data["act"]) == ("desktop", 2)
@@ -0,0 +1,55 @@
+# =========================================
+# file: tests/test_save_slots.py
+# =========================================
+"""SaveSlots: the summary index is recovered from the slot files."""
+
+import os
+
+from src.save_slots import SaveSlots
+
+
+def _make_slots(directory):
+    slots = SaveSlots(str(directory))
+    for slot, name in ((0, "Ada"), (3, "Lin")):
+        game_state = slots.open_slot(slot)
+        game_state.data["player_name"] = name
+        game_state.save()
+    slots.close()
+
+
+def _names(slots):
+    return {s.slot: s.player_name for s in slots.list_slots()}
+
+
+def test_corrupt_index_is_rebuilt_from_slot_files(tmp_path):
+    _make_slots(tmp_path)
+    index_path = os.path.join(str(tmp_path), "index.bin")
+    with open(index_path, "r+b") as f:
+        f.write(b"garbage!")           # clobber the magic
+
+    slots = SaveSlots(str(tmp_path))
+    try:
+        assert slots.index.fresh
+        assert _names(slots) == {0: "Ada", 3: "Lin"}
+    finally:
+        slots.close()
+
+
+def test_truncated_and_missing_index_are_rebuilt(tmp_path):
+    _make_slots(tmp_path)
+    index_path = os.path.join(str(tmp_path), "index.bin")
+    with open(index_path, "r+b") as f:
+        f.truncate(3)
+    slots = SaveSlots(str(tmp_path))
+    assert _names(slots) == {0: "Ada", 3: "Lin"}
+    slots.close()
+
+    os.remove(index_path)
+    slots = SaveSlots(str(tmp_path))
+    assert _names(slots) == {0: "Ada", 3: "Lin"}
+    slots.close()
+
+    slots = SaveSlots(str(tmp_path))   # intact index: no rebuild needed
+    assert not slots.index.fresh
+    assert _names(slots) == {0: "Ada", 3: "Lin"}
+    slots.close()
@@ -0,0 +1,91 @@
+# =========================================
+# file: tests/test_transactions.py
+# =========================================
+"""GameState.transaction(): commit once, roll back memory and disk."""
+
+import pytest
+
+from src.game_state import GameState
+
+
+class _Abort(Exception):
+    pass
+
+
+@pytest.fixture
+def save_path(tmp_path):
+    return str(tmp_path / "state.json")
+
+
+def _abort(gs, mutate):
+    with pytest.raises(_Abort):
+        with gs.transaction():
+            mutate()
+            raise _Abort()
+
+
+def test_rollback_restores_values_and_tasks(save_path):
+    gs = GameState(save_path)
+    gs.set_flag("kept", True)
+    trust = gs.get_trust()
+
+    def mutate():
+        gs.set_flag("kept", False)
+        gs.set_flag("new_flag", True)
+        gs.change_trust(+0.3)
+        gs.add_task("Rolled back task")
+
+    _abort(gs, mutate)
+    assert gs.get_flag("kept") is True
+    assert "new_flag" not in gs.data["flags"]
+    assert gs.get_trust() == trust
+    assert all(t["text"] != "Rolled back task" for t in gs.tasks())
+    assert not gs.is_dirty()
+
+
+def test_rolled_back_clear_flag_matches_on_disk(save_path):
+    gs = GameState(save_path)
+    gs.set_flag("met_mentor", True)
+    _abort(gs, lambda: gs.clear_flag("met_mentor"))
+    gs.flush()
+    assert gs.get_flag("met_mentor") is True
+    assert GameState(save_path).get_flag("met_mentor") is True
+
+
+def test_write_behind_rollback_leaves_state_clean(save_path):
+    gs = GameState(save_path, write_behind=True)
+    gs.flush()
+    _abort(gs, lambda: gs.set_flag("x", True))
+    assert not gs.is_dirty() and gs._pending_log == []
+
+    def mutate_and_save():
+        gs.set_flag("y", True)
+        gs.save()
+
+    _abort(gs, mutate_and_save)
+    assert not gs.is_dirty() and not gs._snapshot_pending
+
+
+def test_write_behind_rollback_keeps_earlier_pending_changes(save_path):
+    gs = GameState(save_path, write_behind=True)
+    gs.set_flag("before", True)
+    pending = list(gs._pending_log)
+    _abort(gs, lambda: gs.set_flag("during", True))
+    assert gs.is_dirty() and gs._pending_log == pending
+    gs.flush()
+    loaded = GameState(save_path)
+    assert loaded.get_flag("before") is True
+    assert "during" not in loaded.data["flags"]
+
+
+def test_commit_writes_once_and_notifies_once(save_path):
+    gs = GameState(save_path)
+    diffs = []
+    gs.add_change_listener(diffs.append)
+    appends = gs.io_stats["log_appends"]
+    with gs.transaction():
+        gs.set_flag("a", True)
+        gs.set_flag("b", True)
+    assert gs.io_stats["log_appends"] == appends + 1
+    assert len(diffs) == 1
+    assert GameState(save_path).get_flag("b") is True
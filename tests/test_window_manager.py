@@ -0,0 +1,62 @@
+# =========================================
+# file: tests/test_window_manager.py
+# =========================================
+"""WindowManager event routing when scenes edit overlays in place."""
+
+import pygame
+import pytest
+
+from src.window_manager import WindowManager
+
+
+class _Overlay:
+    is_overlay = True
+
+    def __init__(self, window_manager, name, log):
+        self.name = name
+        self.log = log
+
+    def handle_event(self, event):
+        self.log.append(self.name)
+        return True
+
+
+@pytest.fixture
+def manager():
+    pygame.init()
+    yield WindowManager(pygame.display.set_mode((64, 48)))
+    pygame.quit()
+
+
+def _key():
+    return pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a)
+
+
+def test_topmost_overlay_follows_in_place_edits(manager):
+    log = []
+    manager.open(_Overlay, {"name": "a", "log": log})
+    manager.open(_Overlay, {"name": "b", "log": log})
+    manager.handle_event(_key())
+
+    manager.overlays.pop()
+    manager.overlays.append(_Overlay(manager, "c", log))
+    manager.handle_event(_key())
+
+    manager.overlays.reverse()
+    manager.handle_event(_key())
+
+    manager.overlays[0], manager.overlays[1] = manager.overlays[1], manager.overlays[0]
+    manager.handle_event(_key())
+
+    manager.overlays = [_Overlay(manager, "z", log)]
+    manager.handle_event(_key())
+    assert log == ["b", "c", "a", "c", "z"]
+
+
+def test_dispatch_reuses_the_route_index(manager):
+    log = []
+    manager.open(_Overlay, {"name": "a", "log": log})
+    manager.handle_event(_key())
+    routes = dict(manager._routes)
+    manager.handle_event(_key())
+    assert manager._routes == routes and not manager._routes_dirty